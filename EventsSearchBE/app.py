@@ -1,6 +1,9 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Optional
+import csv
+import io
 import json
 from datetime import datetime
 import threading
@@ -11,8 +14,15 @@ import sys
 import os
 sys.path.append(os.path.dirname(__file__))
 
-from database import DatabaseManager
-from scraper import ScraperManager
+# Scraper modules, bs4, httpx and PIL are only imported once scraping starts
+from database import EXPORT_COLUMNS, MIGRATE_ON_STARTUP, DatabaseManager, decode_cursor, decode_offset_cursor
+from db_executor import BlockingExecutor
+from scraper_manager import ScraperManager
+from scheduler import DEFAULT_INTERVAL as DEFAULT_SCRAPE_INTERVAL, AdaptiveScheduler
+from leader import LeaderElection
+from response_cache import ResponseCache, etag_matches
+from suggest_index import SuggestIndex
+from metrics import REGISTRY, DB_POOL, EVENTS_CACHE, HTTP_REQUEST_SECONDS
 
 app = FastAPI(
     title="AI Bot for Startup & Government Updates",
@@ -29,55 +39,124 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize managers
-db = DatabaseManager()
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Observe per-route latency; routes are labelled by template, not raw path
+    
+    A handler that raises is recorded as a 500 before the error propagates.
+    """
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.labels(
+            method=request.method,
+            route=route.path if route else "unmatched",
+            status=status
+        ).observe(time.perf_counter() - start)
+
+# Initialize managers (no connection or scraper is created until first use)
+db = DatabaseManager(init_schema=False)
 scraper_manager = ScraperManager(db)
 
-# Auto-scraper configuration
-AUTO_SCRAPE_INTERVAL = 1800  # 30 minutes in seconds
-auto_scraper_running = False
-last_auto_scrape = None
+# Blocking DatabaseManager calls from async handlers run here, never on the event loop
+db_executor = BlockingExecutor(int(os.getenv('DB_EXECUTOR_WORKERS', db.pool.size if db.pool else 5)))
+
+# Largest page GET /events serves; deeper reads page with next_cursor
+EVENTS_MAX_LIMIT = int(os.getenv('EVENTS_MAX_LIMIT', 200))
+
+# Serialized /events responses, dropped whenever an ingest in this process commits.
+# Ingests by a scrape worker or another node (SCRAPER_MODE=api, leader election
+# followers) do not reach this listener, so EVENTS_CACHE_TTL bounds how stale
+# their results can be here.
+events_cache = ResponseCache()
+db.add_commit_listener(events_cache.invalidate)
+
+# Typeahead index over titles and organizers, built at startup and extended after each
+# local ingest, and every SUGGEST_REFRESH_INTERVAL seconds for rows other processes wrote
+suggest_index = SuggestIndex()
+db.add_commit_listener(lambda: suggest_index.refresh(db))
+SUGGEST_REFRESH_INTERVAL = float(os.getenv('SUGGEST_REFRESH_INTERVAL', 60))
+suggest_refresh_stop = threading.Event()
 
-def background_auto_scraper():
-    """Background thread that runs scraping automatically"""
-    global auto_scraper_running, last_auto_scrape
-    while auto_scraper_running:
+def prepare_database():
+    """Apply the schema unless that is a separate deploy step, then start scraping and load the typeahead index"""
+    if MIGRATE_ON_STARTUP:
         try:
-            current_time = datetime.now()
-            print(f"[{current_time}] Running automatic scraping...")
-            results = scraper_manager.scrape_all()
-            total_new = sum(len(events) for events in results.values())
-            last_auto_scrape = current_time
-            print(f"[{current_time}] Auto-scraper found {total_new} new events")
+            db.init_database()
+            print(f"[{datetime.now()}] Database schema at version {db.schema_version}")
         except Exception as e:
-            print(f"[{datetime.now()}] Auto-scraper error: {e}")
-        
-        time.sleep(AUTO_SCRAPE_INTERVAL)
+            print(f"[{datetime.now()}] Database initialization failed: {e}")
+    if SCRAPER_MODE == 'api':
+        print(f"[{datetime.now()}] API-only mode: scraping is left to the scrape worker")
+    else:
+        start_auto_scraper()
+    build_suggest_index()
+    refresh_suggest_index_periodically()
+
+def refresh_suggest_index_periodically():
+    """Catch the suggest index up with events ingested by other processes until shutdown"""
+    while not suggest_refresh_stop.wait(SUGGEST_REFRESH_INTERVAL):
+        if not suggest_index.ready:
+            # The startup build failed (e.g. the database was unreachable); retry it
+            build_suggest_index()
+            continue
+        try:
+            suggest_index.refresh(db)
+        except Exception as e:
+            print(f"[{datetime.now()}] Suggest index refresh failed: {e}")
+
+def build_suggest_index():
+    """Load the typeahead index from the database"""
+    try:
+        suggest_index.rebuild(db)
+        suggest_index.refresh(db)
+        stats = suggest_index.stats()
+        print(f"[{datetime.now()}] Suggest index built: {stats['entries']} entries, ~{stats['approx_bytes'] // 1024} KB in {stats['build_seconds']}s")
+    except Exception as e:
+        print(f"[{datetime.now()}] Suggest index build failed: {e}")
+
+# Auto-scraper: every source runs on its own adaptive interval (see scheduler.py).
+# With leader election on, only the worker or node holding the MySQL lock scrapes.
+# SCRAPER_MODE=api never scrapes in this process; run worker.py as the scraping tier.
+SCRAPER_MODE = os.getenv('SCRAPER_MODE', 'embedded').lower()
+AUTO_SCRAPE_INTERVAL = DEFAULT_SCRAPE_INTERVAL
+leader = LeaderElection(db) if os.getenv('SCRAPER_LEADER_ELECTION', 'true').lower() == 'true' else None
+scheduler = AdaptiveScheduler(scraper_manager, db, leader=leader)
 
 def start_auto_scraper():
     """Start the background auto-scraper"""
-    global auto_scraper_running
-    if not auto_scraper_running:
-        auto_scraper_running = True
-        thread = threading.Thread(target=background_auto_scraper, daemon=True)
-        thread.start()
-        print(f"[{datetime.now()}] Auto-scraper started (runs every {AUTO_SCRAPE_INTERVAL/60} minutes)")
+    if not scheduler.running:
+        scheduler.start()
+        print(f"[{datetime.now()}] Auto-scraper started (adaptive per-source intervals, default {AUTO_SCRAPE_INTERVAL/60} minutes)")
 
 def stop_auto_scraper():
     """Stop the background auto-scraper"""
-    global auto_scraper_running
-    auto_scraper_running = False
+    scheduler.stop()
     print(f"[{datetime.now()}] Auto-scraper stopped")
 
 @app.on_event("startup")
 async def startup_event():
-    """Start background processes when app starts"""
-    start_auto_scraper()
+    """Start background processes when app starts; requests are served while they run"""
+    threading.Thread(target=prepare_database, daemon=True).start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up when app shuts down"""
     stop_auto_scraper()
+    suggest_refresh_stop.set()
+    if 'http_client' in sys.modules:
+        from http_client import close_http_client
+        close_http_client()
+    if 'image_pipeline' in sys.modules:
+        from image_pipeline import close_image_pipeline
+        close_image_pipeline()
+    db_executor.close()
+    db.close()
 
 @app.get("/")
 async def root():
@@ -85,7 +164,8 @@ async def root():
     return {
         "message": "AI Bot for Startup & Government Updates API",
         "status": "running",
-        "auto_scraper": "running" if auto_scraper_running else "stopped",
+        "auto_scraper": "running" if scheduler.running else "stopped",
+        "scraper_mode": SCRAPER_MODE,
         "auto_scrape_interval_minutes": AUTO_SCRAPE_INTERVAL / 60,
         "timestamp": datetime.now().isoformat()
     }
@@ -93,64 +173,233 @@ async def root():
 @app.get("/status")
 async def get_status():
     """Get detailed status including auto-scraper information"""
+    stats = await db_executor.run(db.get_event_stats)
     return {
         "api_status": "running",
         "auto_scraper": {
-            "running": auto_scraper_running,
+            "mode": SCRAPER_MODE,
+            "running": scheduler.running,
             "interval_minutes": AUTO_SCRAPE_INTERVAL / 60,
-            "last_run": last_auto_scrape.isoformat() if last_auto_scrape else None
+            "last_run": scheduler.last_run.isoformat() if scheduler.last_run else None,
+            "leader": leader.stats() if leader else None,
+            "schedule": scheduler.schedule()
         },
         "database": {
-            "total_events": len(db.get_events())
+            "total_events": stats["total_events"],
+            "events_by_type": stats["by_type"],
+            "events_by_source": stats["by_source"],
+            "pool": db.pool_stats(),
+            "executor": db_executor.stats(),
+            "schema_version": db.schema_version
         },
+        "sources": stats["sources"],
+        "events_cache": events_cache.stats(),
+        "suggest_index": suggest_index.stats(),
         "timestamp": datetime.now().isoformat()
     }
 
 @app.get("/events")
 async def get_events(
-    limit: int = 50,
+    request: Request,
+    limit: int = Query(50, ge=1, le=EVENTS_MAX_LIMIT),
     event_type: Optional[str] = None,
-    remove_duplicates: bool = True
+    remove_duplicates: bool = True,
+    cursor: Optional[str] = None
 ):
-    """Get events from the database with optional deduplication"""
+    """Get events from the database with optional deduplication
+    
+    Results are paginated by keyset: pass the returned next_cursor as
+    cursor to fetch the following page (works with event_type too).
+    Duplicates (same normalized title, or near-duplicates of the same
+    event from other sources) are resolved at ingest, so with
+    remove_duplicates each page holds exactly limit unique events while
+    more exist. Responses are cached until the next ingest and carry a
+    strong ETag; a matching If-None-Match gets 304.
+    """
     try:
-        events = db.get_events(limit=limit*2, event_type=event_type)  # Get more events initially for deduplication
-        
-        # Map database fields to frontend-expected fields
-        formatted_events = []
-        for event in events:
-            formatted_event = dict(event)
-            # Map source_url to url for frontend compatibility
-            formatted_event['url'] = event.get('source_url', '')
-            # Map organizer to source for frontend compatibility
-            formatted_event['source'] = event.get('organizer', 'Unknown')
-            # Ensure type field exists
-            formatted_event['type'] = event.get('event_type', 'startup_program')
-            formatted_events.append(formatted_event)
-        
-        # Remove duplicates if requested
-        if remove_duplicates:
-            unique_events = []
-            seen_titles = set()
-            
-            for event in formatted_events:
-                title = event.get('title', '').strip().lower()
-                if title and title not in seen_titles:
-                    seen_titles.add(title)
-                    unique_events.append(event)
-                elif not title:  # Keep events without titles
-                    unique_events.append(event)
-            
-            formatted_events = unique_events[:limit]  # Apply limit after deduplication
-        
-        return {
-            "events": formatted_events,
-            "count": len(formatted_events),
-            "duplicates_removed": remove_duplicates,
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    cache_key = ('events', limit, event_type, remove_duplicates, cursor)
+    cached = events_cache.get(cache_key)
+    if cached is None:
+        generation = events_cache.generation
+        try:
+            payload = await db_executor.run(_events_payload, limit, event_type, remove_duplicates, position)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        cached = events_cache.put(cache_key, json.dumps(payload).encode('utf-8'), generation)
+    
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+def _events_payload(limit: int, event_type: Optional[str], remove_duplicates: bool, position) -> dict:
+    """Build the /events response body"""
+    events, next_cursor = db.get_events_page(
+        limit=limit,
+        event_type=event_type,
+        cursor=position,
+        canonical_only=remove_duplicates
+    )
+    
+    formatted_events = [_frontend_event(event) for event in events]
+    
+    return {
+        "events": formatted_events,
+        "count": len(formatted_events),
+        "duplicates_removed": remove_duplicates,
+        "next_cursor": next_cursor,
+        "timestamp": datetime.now().isoformat()
+    }
+
+def _frontend_event(event: dict) -> dict:
+    """Map database fields to frontend-expected fields"""
+    formatted_event = dict(event)
+    # Map source_url to url for frontend compatibility
+    formatted_event['url'] = event.get('source_url', '')
+    # Map organizer to source for frontend compatibility
+    formatted_event['source'] = event.get('organizer', 'Unknown')
+    # Ensure type field exists
+    formatted_event['type'] = event.get('event_type', 'startup_program')
+    return formatted_event
+
+@app.get("/events/search")
+async def search_events(
+    request: Request,
+    q: str,
+    limit: int = Query(20, ge=1, le=EVENTS_MAX_LIMIT),
+    event_type: Optional[str] = None,
+    cursor: Optional[str] = None
+):
+    """Full-text search over event titles and descriptions
+    
+    Results are ranked by relevance, exclude duplicate rows and can be
+    narrowed with event_type. Pass the returned next_cursor as cursor for
+    the following page. Cached and ETagged like /events.
+    """
+    query = ' '.join(q.split())
+    if not query:
+        raise HTTPException(status_code=400, detail="Query must not be empty")
+    try:
+        offset = decode_offset_cursor(cursor) if cursor else 0
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    cache_key = ('search', query.lower(), limit, event_type, offset)
+    cached = events_cache.get(cache_key)
+    if cached is None:
+        generation = events_cache.generation
+        try:
+            events, next_cursor = await db_executor.run(
+                db.search_events, query, limit=limit, event_type=event_type, offset=offset
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        payload = {
+            "query": query,
+            "events": [_frontend_event(event) for event in events],
+            "count": len(events),
+            "next_cursor": next_cursor,
             "timestamp": datetime.now().isoformat()
         }
+        cached = events_cache.put(cache_key, json.dumps(payload).encode('utf-8'), generation)
+    
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+@app.get("/events/suggest")
+async def suggest_events(prefix: str = "", limit: int = 8):
+    """Typeahead suggestions for event titles and organizers
+    
+    Served from the in-memory trigram index, so no database round trip is
+    made; matching tolerates small typos once the prefix is 3+ characters.
+    """
+    start = time.perf_counter()
+    suggestions = suggest_index.suggest(prefix, limit=min(max(limit, 0), 50))
+    return {
+        "prefix": prefix,
+        "suggestions": suggestions,
+        "ready": suggest_index.ready,
+        "took_ms": round((time.perf_counter() - start) * 1000, 3)
+    }
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+@app.get("/events/export")
+async def export_events(
+    format: str = "ndjson",
+    event_type: Optional[str] = None,
+    remove_duplicates: bool = False
+):
+    """Stream every event as NDJSON (one object per line) or CSV
+    
+    Rows are read in fixed-size chunks from an unbuffered cursor and
+    written out chunk by chunk, so memory stays flat for any table size
+    and the first rows are sent as soon as the first chunk is read.
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_MEDIA_TYPES)}")
+    
+    chunks = db.iter_event_chunks(event_type=event_type, canonical_only=remove_duplicates)
+    body = _export_csv(chunks) if format == "csv" else _export_ndjson(chunks)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="events.{format}"'}
+    )
+
+def _export_ndjson(chunks):
+    """Serialize each event to one JSON line, one write per database chunk"""
+    try:
+        for events in chunks:
+            yield "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events).encode("utf-8")
+    except Exception as e:
+        # Headers are already sent; the truncated body is the only signal left
+        print(f"Error exporting events: {e}")
+
+def _export_csv(chunks):
+    """Serialize events as CSV rows (tags as a JSON array), one write per database chunk"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    def flush() -> bytes:
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data.encode("utf-8")
+    
+    writer.writerow(EXPORT_COLUMNS)
+    yield flush()
+    try:
+        for events in chunks:
+            for event in events:
+                writer.writerow([
+                    json.dumps(event[column]) if column == "tags" else event[column]
+                    for column in EXPORT_COLUMNS
+                ])
+            yield flush()
+    except Exception as e:
+        print(f"Error exporting events: {e}")
+
+@app.get("/events/stats")
+async def get_event_stats():
+    """Get event counts per type and source from the ingest-maintained aggregate"""
+    try:
+        stats = await db_executor.run(db.get_event_stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "total_events": stats["total_events"],
+        "by_type": stats["by_type"],
+        "by_source": stats["by_source"],
+        "last_updated": stats["last_updated"],
+        "timestamp": datetime.now().isoformat()
+    }
 
 @app.get("/events/types")
 async def get_event_types():
@@ -167,39 +416,30 @@ async def get_event_types():
 @app.post("/scrape")
 async def run_scraping(background_tasks: BackgroundTasks):
     """Run the scraping process in the background"""
+    if SCRAPER_MODE == 'api':
+        raise HTTPException(status_code=409, detail="Scraping runs in the scrape worker (SCRAPER_MODE=api); use python -m EventsSearchBE.worker --once")
     background_tasks.add_task(scrape_all_sources)
     return {
         "message": "Scraping started in background",
         "timestamp": datetime.now().isoformat()
     }
 
-async def scrape_all_sources():
-    """Background task to scrape all sources and update database"""
+def scrape_all_sources():
+    """Background task to scrape all sources and update database (runs in the threadpool)
+
+    Goes through ScraperManager.scrape_all like scheduled runs, and
+    reschedules every source from its outcome.
+    """
     try:
         print("Starting scraping process...")
-        results = scraper_manager.run_all_scrapers()
-        
-        total_events = 0
-        for source, events in results.items():
-            events_added = 0
-            
-            for event_data in events:
-                try:
-                    db.insert_event(event_data)
-                    events_added += 1
-                    total_events += 1
-                except Exception as e:
-                    print(f"Error inserting event from {source}: {e}")
-            
-            # Log the scraping result
-            db.log_scraping_result(
-                source=source,
-                events_found=events_added,
-                success=True if events_added > 0 else False,
-                error_message=None
-            )
-            print(f"Added {events_added} events from {source}")
+        results = scraper_manager.scrape_all()
+        for source in results:
+            scheduler.record(source, scraper_manager.last_outcomes.get(source, 'error'))
         
+        total_events = sum(
+            counts['new'] + counts['changed'] + counts['unchanged']
+            for source, counts in scraper_manager.last_changes.items() if source in results
+        )
         print(f"Scraping completed. Total events added: {total_events}")
         
     except Exception as e:
@@ -214,6 +454,62 @@ async def get_scraping_logs():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/scrape/cache")
+async def get_page_cache_stats():
+    """Get conditional-GET page cache hit/miss counts per source"""
+    return {
+        "sources": scraper_manager.cache_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/scrape/changes")
+async def get_scrape_changes():
+    """Get new/changed/unchanged/disappeared event counts per source from the last scrape"""
+    return {
+        "sources": scraper_manager.last_changes,
+        "unchanged_pages": scraper_manager.last_unchanged,
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/scrape/schedule")
+async def get_scrape_schedule():
+    """Get each source's adaptive interval, next run time and last outcome"""
+    return {
+        "running": scheduler.running,
+        "leader": leader.stats() if leader else None,
+        "sources": scheduler.schedule(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+def image_pipeline_stats() -> Optional[dict]:
+    """Stats of the image pipeline if this process has one; never creates it (or its images/ index)"""
+    if 'image_pipeline' not in sys.modules:
+        return None
+    from image_pipeline import peek_image_pipeline
+    pipeline = peek_image_pipeline()
+    return pipeline.stats() if pipeline is not None else None
+
+@app.get("/scrape/images")
+async def get_image_pipeline_stats():
+    """Get image pipeline cache hits and rendering throughput
+    
+    images is null until this process has downloaded images (never with
+    SCRAPER_MODE=api, where the scrape worker owns the pipeline).
+    """
+    return {
+        "images": image_pipeline_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of scraper, database and API metrics"""
+    for stat, value in db.pool_stats().items():
+        DB_POOL.labels(stat=stat).set(value)
+    for stat, value in events_cache.stats().items():
+        EVENTS_CACHE.labels(stat=stat).set(value)
+    return Response(content=REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 @app.post("/events/test")
 async def add_test_event():
     """Add a test event for development"""
@@ -229,7 +525,7 @@ async def add_test_event():
     }
     
     try:
-        event_id = db.insert_event(test_event)
+        event_id = await db_executor.run(db.insert_event, test_event)
         return {
             "message": "Test event added successfully",
             "event_id": event_id,
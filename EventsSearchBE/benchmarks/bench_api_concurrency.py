@@ -0,0 +1,76 @@
+"""
+API throughput at increasing concurrency against a running server
+Throughput should grow with concurrency up to the DB executor size; flat
+requests/second means handlers are serializing on the event loop
+
+Usage: python benchmarks/bench_api_concurrency.py [--url http://localhost:8001]
+           [--path '/events?limit=20&event_type=bench-{n}'] [--levels 1,2,4,8,16] [--requests 200]
+
+{n} in --path is replaced by a per-request counter so each request misses
+the /events response cache and reaches the database.
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+
+import httpx
+
+
+async def run_level(client: httpx.AsyncClient, path: str, concurrency: int, total: int, counter) -> dict:
+    """Issue total requests with concurrency in flight, returning throughput and latency percentiles"""
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                response = await client.get(path.format(n=next(counter)))
+                if response.status_code >= 500:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'rps': total / elapsed,
+        'p50': statistics.median(latencies) * 1000,
+        'p95': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'errors': errors
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:8001')
+    parser.add_argument('--path', default='/events?limit=20&event_type=bench-{n}')
+    parser.add_argument('--levels', default='1,2,4,8,16')
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.levels.split(',')]
+    counter = itertools.count()
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        await client.get(args.path.format(n=next(counter)))  # warm up connections and the server
+        print(f"{args.requests} requests per level to {args.url}{args.path}\n")
+        print(f"{'concurrency':>11} {'req/s':>9} {'x1':>6} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}")
+        baseline = None
+        for concurrency in levels:
+            result = await run_level(client, args.path, concurrency, args.requests, counter)
+            baseline = baseline or result['rps']
+            print(f"{concurrency:>11} {result['rps']:>9.1f} {result['rps'] / baseline:>6.2f} "
+                  f"{result['p50']:>9.1f} {result['p95']:>9.1f} {result['errors']:>7}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
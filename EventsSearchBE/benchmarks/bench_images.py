@@ -0,0 +1,84 @@
+"""
+Image throughput: the old serial full-decode + LANCZOS path vs the
+content-addressed pipeline (JPEG draft decode, process pool, all variants)
+
+Usage: python benchmarks/bench_images.py [--images 40] [--width 2400] [--height 1600] [--workers 4]
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+
+from image_pipeline import ImagePipeline
+
+
+def synthetic_jpeg(index: int, width: int, height: int) -> bytes:
+    """A camera-sized JPEG with gradients and shapes so it does not compress to nothing"""
+    image = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    draw = ImageDraw.Draw(image)
+    for i in range(40):
+        x, y = (index * 97 + i * 131) % width, (index * 53 + i * 71) % height
+        draw.ellipse((x, y, x + width // 8, y + height // 8), fill=((i * 37) % 256, (index * 11) % 256, 128))
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def serial_baseline(contents, out_dir: str) -> float:
+    """Previous download_image behaviour: full decode, one 400x300 JPEG, on the calling thread"""
+    start = time.perf_counter()
+    for i, content in enumerate(contents):
+        image = Image.open(io.BytesIO(content))
+        image.thumbnail((400, 300), Image.Resampling.LANCZOS)
+        if image.mode in ("RGBA", "P"):
+            image = image.convert("RGB")
+        image.save(os.path.join(out_dir, f"{i}.jpg"), "JPEG", quality=85, optimize=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--images', type=int, default=40)
+    parser.add_argument('--width', type=int, default=2400)
+    parser.add_argument('--height', type=int, default=1600)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    contents = [synthetic_jpeg(i, args.width, args.height) for i in range(args.images)]
+    print(f"{args.images} JPEGs of {args.width}x{args.height}, "
+          f"{sum(map(len, contents)) / len(contents) / 1024:.0f} KiB each\n")
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        seconds = serial_baseline(contents, out_dir)
+        print(f"{'serial, 1 variant':<38} {seconds:>7.2f}s {args.images / seconds:>8.1f} img/s")
+
+    for sizes, formats in (('thumb:400x300', 'jpeg'), (None, None)):
+        with tempfile.TemporaryDirectory() as images_dir:
+            pipeline = ImagePipeline(images_dir=images_dir, sizes=sizes, formats=formats,
+                                     workers=args.workers, http=object())
+            variants = len(pipeline.sizes) * len(pipeline.formats)
+            keyed = {f"https://img.example/{i}.jpg": content for i, content in enumerate(contents)}
+
+            # Start the worker processes outside the timed section
+            pipeline.process_contents({'https://img.example/warmup.jpg': synthetic_jpeg(-1, 64, 64)})
+            start = time.perf_counter()
+            pipeline.process_contents(keyed)
+            seconds = time.perf_counter() - start
+            label = f"pipeline, {variants} variant(s), {pipeline.workers} workers"
+            print(f"{label:<38} {seconds:>7.2f}s {args.images / seconds:>8.1f} img/s")
+
+            start = time.perf_counter()
+            hits = sum(1 for url in keyed if pipeline.lookup(url))
+            print(f"{'  rerun (stored, skipped by URL)':<38} {time.perf_counter() - start:>7.2f}s  {hits}/{args.images} skipped")
+            pipeline.close()
+
+
+if __name__ == '__main__':
+    main()
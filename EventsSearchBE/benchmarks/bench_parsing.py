@@ -0,0 +1,73 @@
+"""
+Parse time and peak memory per source: full html.parser trees vs the
+configured backend with each scraper's parse_only declaration
+
+Usage: python benchmarks/bench_parsing.py [--cards 500] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+
+from new_scrapers import EventbriteScraper, GlobalStartupAwardsScraper, Inc42Scraper
+from parsing import HTML_PARSER, make_soup
+from scraper import NasscomScraper, StartupEventsScraper, StartupIndiaScraper, THubScraper
+from synthetic_pages import PAGE_BUILDERS
+
+SCRAPER_CLASSES = {
+    'Startup Events': StartupEventsScraper,
+    'Startup India': StartupIndiaScraper,
+    'T-Hub': THubScraper,
+    'NASSCOM': NasscomScraper,
+    'Inc42': Inc42Scraper,
+    'Eventbrite': EventbriteScraper,
+    'GlobalStartupAwards': GlobalStartupAwardsScraper,
+}
+
+
+def measure(parse, markup: bytes, repeat: int):
+    """Median parse time in ms, peak traced memory in KiB and node count"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(markup)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    soup = parse(markup)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nodes = sum(1 for _ in soup.descendants)
+    return statistics.median(timings), peak / 1024, nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cards', type=int, default=500, help='event cards per synthetic page')
+    parser.add_argument('--repeat', type=int, default=5, help='timed parses per measurement')
+    args = parser.parse_args()
+
+    print(f"Backend after: {HTML_PARSER} + parse_only, cards per page: {args.cards}\n")
+    header = f"{'source':<20} {'KiB page':>9} {'ms before':>10} {'ms after':>9} {'KiB peak before':>16} {'KiB peak after':>15} {'nodes before':>13} {'nodes after':>12}"
+    print(header)
+    print('-' * len(header))
+
+    for source, build in PAGE_BUILDERS.items():
+        markup = build(args.cards)
+        strainer = SCRAPER_CLASSES[source].parse_only
+        before = measure(lambda m: BeautifulSoup(m, 'html.parser'), markup, args.repeat)
+        after = measure(lambda m: make_soup(m, strainer), markup, args.repeat)
+        print(f"{source:<20} {len(markup) / 1024:>9.0f} {before[0]:>10.1f} {after[0]:>9.1f} "
+              f"{before[1]:>16.0f} {after[1]:>15.0f} {before[2]:>13} {after[2]:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+"""
+Offline scraper benchmarks: parse + extract throughput and peak memory per source
+Every registered scraper's scrape() runs unchanged against recorded fixture
+pages (benchmarks/fixtures) and against synthetic pages with thousands of
+cards; fetches are answered from memory, so no network is needed.
+
+Usage: python benchmarks/bench_scrapers.py [--cards 2000] [--repeat 5] [--tolerance 0.25]
+           [--sources Inc42,Eventbrite] [--save-baseline] [--record]
+
+Each run is appended to benchmarks/results/history.jsonl and compared with
+benchmarks/results/baseline.json (written by --save-baseline on a known-good
+tree). A case whose median time or peak memory exceeds the baseline by more
+than --tolerance is flagged and the script exits with status 1.
+
+Throughput counts the cards actually extracted: events whose title appears in
+the page text. Hard-coded events a scraper adds regardless of the page are
+reported under events but are not cards. On synthetic pages the declarative
+scrapers run with their card limits lifted so every card is extracted; sources
+that extract no cards from a synthetic page get no synthetic case. Startup
+India and T-Hub keep their 10-card limit, so their synthetic cases mostly
+measure parsing a large page. --record refetches each fixture from its source
+(this needs network).
+"""
+
+import argparse
+import contextlib
+import gc
+import html
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from extraction import DeclarativeScraper, compile_spec
+from page_cache import PageCache
+from parsing import HTML_PARSER
+from scraper_registry import load_scraper_class, registered_sources
+from synthetic_pages import PAGE_BUILDERS
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+
+class FixtureClient:
+    """Answers HttpClient.get from in-memory pages; URLs without a page are 404s"""
+
+    def __init__(self, pages: Dict[str, bytes], default: bytes = None):
+        self.pages = pages
+        self.default = default
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        body = self.pages.get(url, self.default)
+        request = httpx.Request('GET', url)
+        if body is None:
+            return httpx.Response(404, request=request)
+        return httpx.Response(200, content=body, request=request)
+
+
+def offline_scraper(source: str, client: FixtureClient, unlimited: bool = False):
+    """A source's scraper fetching from client, with conditional GETs disabled"""
+    scraper = load_scraper_class(source)()
+    scraper.http = client
+    scraper.page_cache = PageCache(enabled=False)
+    if unlimited and isinstance(scraper, DeclarativeScraper):
+        scraper.extractor = compile_spec(dict(scraper.extractor.spec, limit=None, max_events=None))
+    return scraper
+
+
+def page_text(markup: bytes) -> str:
+    """Page markup without tags, entities decoded and whitespace collapsed"""
+    text = re.sub(r'<[^>]*>', '', markup.decode('utf-8', errors='replace'))
+    return ' '.join(html.unescape(text).split())
+
+
+def count_cards(events: List[Dict[str, Any]], text: str) -> int:
+    """Events extracted from the page; hard-coded events don't appear in its text"""
+    return sum(1 for event in events if event.get('title') and ' '.join(event['title'].split()) in text)
+
+
+def extracts_cards(source: str, markup: bytes) -> bool:
+    """Whether the source's scraper pulls any card out of markup"""
+    scraper = offline_scraper(source, FixtureClient({}, default=markup), unlimited=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        events = scraper.scrape()
+    return count_cards(events, page_text(markup)) > 0
+
+
+def load_manifest() -> Dict[str, Dict[str, Any]]:
+    with open(os.path.join(FIXTURES_DIR, 'manifest.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_cases(sources: List[str], cards: int) -> List[Dict[str, Any]]:
+    """Fixture case per source (sources without one fetch nothing), plus a synthetic case
+    for sources that extract cards from their synthetic page"""
+    manifest = load_manifest()
+    cases = []
+    for source in sources:
+        entry = manifest.get(source)
+        pages = {}
+        if entry:
+            with open(os.path.join(FIXTURES_DIR, entry['file']), 'rb') as f:
+                pages[entry['url']] = f.read()
+        cases.append({
+            'name': f"{source} (fixture)" if entry else f"{source} (no page)",
+            'source': source,
+            'client': FixtureClient(pages),
+            'page_bytes': sum(len(page) for page in pages.values()),
+            'text': ' '.join(page_text(page) for page in pages.values()),
+            'unlimited': False
+        })
+    for source in sources:
+        if source in PAGE_BUILDERS and extracts_cards(source, PAGE_BUILDERS[source](20)):
+            markup = PAGE_BUILDERS[source](cards)
+            cases.append({
+                'name': f"{source} @{cards} cards",
+                'source': source,
+                'client': FixtureClient({}, default=markup),
+                'page_bytes': len(markup),
+                'text': page_text(markup),
+                'unlimited': True
+            })
+    return cases
+
+
+def run_case(case: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """Median scrape() time, cards per second and peak traced memory for one case"""
+    scraper = offline_scraper(case['source'], case['client'], case['unlimited'])
+    quiet = io.StringIO()
+
+    def scrape():
+        with contextlib.redirect_stdout(quiet):
+            events = scraper.scrape()
+        quiet.seek(0)
+        quiet.truncate()
+        return events
+
+    events = scrape()  # warm up
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        scrape()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    scrape()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = statistics.median(timings)
+    cards = count_cards(events, case['text'])
+    return {
+        'ms': round(seconds * 1000, 2),
+        'cards_per_sec': round(cards / seconds, 1) if cards else None,
+        'peak_kib': round(peak / 1024, 1),
+        'cards': cards,
+        'events': len(events),
+        'page_kib': round(case['page_bytes'] / 1024, 1)
+    }
+
+
+def find_regressions(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                     tolerance: float) -> Dict[str, List[str]]:
+    """Per case, the metrics that got worse than the baseline by more than tolerance"""
+    regressions = {}
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        flags = []
+        for metric, label in (('ms', 'time'), ('peak_kib', 'memory')):
+            if before.get(metric) and result[metric] > before[metric] * (1 + tolerance):
+                flags.append(f"{label} +{(result[metric] / before[metric] - 1) * 100:.0f}%")
+        for metric in ('cards', 'events'):
+            if before.get(metric) is not None and result[metric] < before[metric]:
+                flags.append(f"{metric} {before[metric]} -> {result[metric]}")
+        if flags:
+            regressions[name] = flags
+    return regressions
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def record_fixtures(sources: List[str]):
+    """Refetch every fixture page from its source"""
+    from http_client import get_http_client
+
+    manifest = load_manifest()
+    http = get_http_client()
+    for source in sources:
+        entry = manifest.get(source)
+        if not entry:
+            continue
+        response = http.get(entry['url'], source=source)
+        response.raise_for_status()
+        with open(os.path.join(FIXTURES_DIR, entry['file']), 'wb') as f:
+            f.write(response.content)
+        with contextlib.redirect_stdout(io.StringIO()):
+            events = offline_scraper(source, FixtureClient({entry['url']: response.content})).scrape()
+        print(f"Recorded {source}: {len(response.content) / 1024:.0f} KiB, "
+              f"{count_cards(events, page_text(response.content))} cards, {len(events)} events")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cards', type=int, default=2000, help='event cards per synthetic page')
+    parser.add_argument('--repeat', type=int, default=5, help='timed scrapes per case')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown or memory growth over the baseline (0.25 = 25%%)')
+    parser.add_argument('--sources', help='comma-separated source names (default: all registered)')
+    parser.add_argument('--results-dir', default=RESULTS_DIR)
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the new baseline')
+    parser.add_argument('--record', action='store_true', help='refetch the fixtures from the live sites first')
+    args = parser.parse_args()
+
+    sources = registered_sources()
+    if args.sources:
+        wanted = [source.strip() for source in args.sources.split(',')]
+        sources = [source for source in sources if source in wanted]
+    if args.record:
+        record_fixtures(sources)
+
+    baseline_path = os.path.join(args.results_dir, 'baseline.json')
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path, encoding='utf-8') as f:
+            stored = json.load(f)
+        if stored.get('parser') != HTML_PARSER:
+            print(f"Baseline was measured with {stored.get('parser')}, not {HTML_PARSER}; not comparing\n")
+        else:
+            baseline = stored['cases']
+
+    print(f"Parser: {HTML_PARSER}, {args.repeat} timed scrapes per case, "
+          f"baseline: {os.path.relpath(baseline_path) if baseline else 'none'}\n")
+    header = (f"{'case':<36} {'KiB page':>9} {'cards':>6} {'events':>7} {'ms':>9} "
+              f"{'cards/s':>9} {'KiB peak':>9}  regression")
+    print(header)
+    print('-' * len(header))
+
+    results = {}
+    regressions = {}
+    for case in build_cases(sources, args.cards):
+        result = results[case['name']] = run_case(case, args.repeat)
+        flags = find_regressions({case['name']: result}, baseline, args.tolerance).get(case['name'])
+        if flags:
+            regressions[case['name']] = flags
+        rate = f"{result['cards_per_sec']:.0f}" if result['cards_per_sec'] else '-'
+        print(f"{case['name']:<36} {result['page_kib']:>9.0f} {result['cards']:>6} {result['events']:>7} "
+              f"{result['ms']:>9.2f} {rate:>9} {result['peak_kib']:>9.0f}  {', '.join(flags or [])}")
+
+    run = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'parser': HTML_PARSER,
+        'repeat': args.repeat,
+        'cases': results
+    }
+    os.makedirs(args.results_dir, exist_ok=True)
+    with open(os.path.join(args.results_dir, 'history.jsonl'), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(run) + '\n')
+    if args.save_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"\nSaved baseline to {os.path.relpath(baseline_path)}")
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed beyond {args.tolerance:.0%} of the baseline")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+API startup cost: import time of app and time until the first request is served
+Each sample runs in a fresh interpreter. Also reports which scraping-only
+modules were imported with the API; they should load only once scraping runs.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--port 8011] [--skip-server]
+
+The server run uses SCRAPER_MODE=api and DB_MIGRATE_ON_STARTUP=false unless
+set otherwise, so no scrape or migration competes with the first request.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['bs4', 'lxml', 'PIL', 'httpx', 'scraper', 'new_scrapers', 'image_pipeline']
+
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import app
+print(round((time.perf_counter() - start) * 1000, 1))
+print('loaded:' + ','.join(m for m in {modules!r} if m in sys.modules))
+"""
+
+
+def import_sample() -> tuple:
+    """Milliseconds to import app in a fresh interpreter, and the heavy modules it loaded"""
+    output = subprocess.run(
+        [sys.executable, '-c', IMPORT_PROBE.format(modules=HEAVY_MODULES)],
+        cwd=APP_DIR, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()
+    return float(output[-2]), [m for m in output[-1][len('loaded:'):].split(',') if m]
+
+
+def first_request_sample(port: int) -> float:
+    """Seconds from spawning uvicorn until GET / answers 200"""
+    env = dict(os.environ)
+    env.setdefault('SCRAPER_MODE', 'api')
+    env.setdefault('DB_MIGRATE_ON_STARTUP', 'false')
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < 60:
+            try:
+                if httpx.get(f'http://127.0.0.1:{port}/', timeout=1).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.01)
+        raise RuntimeError("server did not answer within 60s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--port', type=int, default=8011)
+    parser.add_argument('--skip-server', action='store_true', help="only measure the import")
+    args = parser.parse_args()
+
+    samples = [import_sample() for _ in range(args.runs)]
+    print(f"import app: median {statistics.median(ms for ms, _ in samples):.0f} ms "
+          f"(min {min(ms for ms, _ in samples):.0f}, max {max(ms for ms, _ in samples):.0f})")
+    print(f"scraping modules loaded: {', '.join(samples[-1][1]) or 'none'}")
+
+    if not args.skip_server:
+        seconds = [first_request_sample(args.port) for _ in range(args.runs)]
+        print(f"first request: median {statistics.median(seconds) * 1000:.0f} ms "
+              f"(min {min(seconds) * 1000:.0f}, max {max(seconds) * 1000:.0f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Synthetic listing pages shaped like each scraped source
+Used by the offline benchmarks; every page carries realistic boilerplate
+(inline scripts, styles, navigation, footer) around the event cards
+"""
+
+from typing import Callable, Dict
+
+BOILERPLATE_HEAD = (
+    "<head><meta charset='utf-8'><title>%s</title>"
+    + "<style>" + ".c{color:#333;margin:0 auto;padding:4px}" * 200 + "</style>"
+    + "<script>" + "window.dataLayer=window.dataLayer||[];dataLayer.push({e:'x'});" * 300 + "</script>"
+    + "</head>"
+)
+NAV = "<nav><ul>" + "".join(f"<li><a href='/section/{i}'>Section {i}</a></li>" for i in range(80)) + "</ul></nav>"
+FOOTER = "<footer>" + "".join(f"<div class='footer-col'><p>Footer text {i}</p><a href='/f/{i}'>Link</a></div>" for i in range(40)) + "</footer>"
+
+
+def _page(title: str, body: str) -> bytes:
+    return f"<!DOCTYPE html><html>{BOILERPLATE_HEAD % title}<body>{NAV}<main>{body}</main>{FOOTER}</body></html>".encode('utf-8')
+
+
+def startup_india(cards: int) -> bytes:
+    body = "".join(
+        f"<div class='scheme-card'><h3>Startup Scheme {i}</h3><p>Support scheme number {i} for early-stage founders.</p>"
+        f"<a href='/content/sih/en/scheme-{i}.html'>Read more</a></div>"
+        for i in range(cards)
+    )
+    return _page("Government Schemes", body)
+
+
+def thub(cards: int) -> bytes:
+    body = "".join(
+        f"<div class='event-item'><h2>T-Hub Cohort {i}</h2><p>Programme {i} for deep-tech founders.</p>"
+        f"<time>2025-11-{i % 28 + 1:02d}</time><a href='/events/{i}'>Apply</a></div>"
+        for i in range(cards)
+    )
+    return _page("T-Hub Events", body)
+
+
+def landing_page(cards: int) -> bytes:
+    body = "".join(
+        f"<section class='promo'><h2>Highlight {i}</h2><p>Promotional copy {i}.</p><img src='/img/{i}.jpg'></section>"
+        for i in range(cards)
+    )
+    return _page("Landing", body)
+
+
+def inc42(cards: int) -> bytes:
+    body = "".join(
+        f"<article class='post-item'><h2><a href='/buzz/startup-summit-{i}'>Startup funding summit edition {i} announced</a></h2>"
+        f"<p class='excerpt'>Founders and investors meet at edition {i}.</p>"
+        f"<time class='date' datetime='2025-11-{i % 28 + 1:02d}T10:00:00Z'>Nov {i % 28 + 1}</time>"
+        f"<img src='/wp-content/uploads/{i}.jpg'></article>"
+        for i in range(cards)
+    )
+    return _page("Inc42 Events", body)
+
+
+def eventbrite(cards: int) -> bytes:
+    body = "".join(
+        f"<div class='event-card'><h3 class='event-card__title'>Startup networking night {i}</h3>"
+        f"<a href='/e/startup-night-{i}'>Details</a>"
+        f"<time datetime='2025-12-{i % 28 + 1:02d}T18:00:00'>Dec {i % 28 + 1}</time>"
+        f"<div class='location-info'>Bengaluru, India</div>"
+        f"<p class='summary'>Meet founders at night {i}.</p><img src='//img.evbuc.com/{i}.jpg'></div>"
+        for i in range(cards)
+    )
+    return _page("Startup events in India", body)
+
+
+def global_startup_awards(cards: int) -> bytes:
+    body = "".join(
+        f"<h2><a href='/events/summit-{i}'>Global Summit {i}</a></h2>"
+        f"<p>November {i % 28 + 1}, 2025</p><p>LISBON, PORTUGAL</p><p>Annual gathering number {i}.</p>"
+        for i in range(cards)
+    )
+    return _page("Startup Events Worldwide", body)
+
+
+# Source name -> page builder
+PAGE_BUILDERS: Dict[str, Callable[[int], bytes]] = {
+    'Startup Events': landing_page,
+    'Startup India': startup_india,
+    'T-Hub': thub,
+    'NASSCOM': landing_page,
+    'Inc42': inc42,
+    'Eventbrite': eventbrite,
+    'GlobalStartupAwards': global_startup_awards,
+}
@@ -1,15 +1,253 @@
 import mysql.connector
-from datetime import datetime
-from typing import List, Dict, Any
+import base64
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from collections import Counter, defaultdict
 import json
 import os
+import time
 from dotenv import load_dotenv
 
+from db_pool import ConnectionPool
+from fingerprints import content_fingerprint, event_minhash, lsh_buckets, signature_similarity, title_fingerprint
+from metrics import DB_QUERY_SECONDS, timed
+
 # Load environment variables
 load_dotenv()
 
+# Rows per multi-row INSERT statement in insert_events_batch
+BATCH_CHUNK_SIZE = 500
+
+# Date formats scrapers emit besides ISO dates
+_DATE_FORMATS = ['%B %d, %Y', '%b %d, %Y', '%B %d %Y', '%b %d %Y', '%d %B %Y', '%d %b %Y',
+                 '%d-%m-%Y', '%d/%m/%Y', '%B %Y', '%b %Y']
+
+# Versioned schema changes applied in order by DatabaseManager.migrate().
+# Append new versions only; every step is idempotent so a partially applied
+# version can simply be re-run. Step kinds:
+#   ('index', table, name, columns[, 'UNIQUE' | 'FULLTEXT'])
+#   ('column', table, name, definition)
+#   ('sql', statement)
+#   ('python', method_name)  -- DatabaseManager method called with a cursor
+MIGRATIONS = [
+    (1, 'Indexes for /events listing, type filter and cleanup', [
+        ('index', 'bot_events', 'idx_event_type_created', '(event_type, created_at)'),
+        ('index', 'bot_events', 'idx_created_at', '(created_at)'),
+        ('index', 'bot_events', 'idx_date', '(date)'),
+    ]),
+    (2, 'Title fingerprints and canonical rows for database-side deduplication', [
+        ('column', 'bot_events', 'title_fingerprint', 'CHAR(40) NULL'),
+        ('column', 'bot_events', 'canonical_id', 'INT NULL'),
+        ('python', '_backfill_title_fingerprints'),
+        ('index', 'bot_events', 'idx_title_fingerprint', '(title_fingerprint)'),
+        ('index', 'bot_events', 'idx_canonical_created', '(canonical_id, created_at)'),
+        ('index', 'bot_events', 'idx_type_canonical_created', '(event_type, canonical_id, created_at)'),
+    ]),
+    (3, 'Scraper source column, event count aggregates and last run per source', [
+        ('column', 'bot_events', 'source', 'VARCHAR(255) NULL'),
+        ('sql', "UPDATE bot_events SET source = organizer WHERE source IS NULL"),
+        ('index', 'bot_events', 'idx_source', '(source)'),
+        ('sql', """
+            CREATE TABLE IF NOT EXISTS bot_event_counts (
+                dimension VARCHAR(20) NOT NULL,
+                name VARCHAR(255) NOT NULL,
+                events INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (dimension, name)
+            )
+        """),
+        ('python', '_rebuild_event_counts'),
+        ('sql', """
+            CREATE TABLE IF NOT EXISTS bot_source_runs (
+                source VARCHAR(255) PRIMARY KEY,
+                last_run_at TIMESTAMP NULL,
+                last_success BOOLEAN DEFAULT FALSE,
+                last_events_found INT DEFAULT 0,
+                last_error TEXT,
+                runs INT NOT NULL DEFAULT 0,
+                failures INT NOT NULL DEFAULT 0
+            )
+        """),
+        ('sql', """
+            INSERT INTO bot_source_runs (source, last_run_at, last_success, last_events_found, last_error, runs, failures)
+            SELECT l.source, l.timestamp, l.success, l.events_found, l.error_message, agg.runs, agg.failures
+            FROM bot_scraping_logs l
+            JOIN (
+                SELECT MAX(id) AS id, COUNT(*) AS runs, SUM(NOT success) AS failures
+                FROM bot_scraping_logs GROUP BY source
+            ) agg ON l.id = agg.id
+            ON DUPLICATE KEY UPDATE source = bot_source_runs.source
+        """),
+    ]),
+    (4, 'Full-text index for /events/search', [
+        ('index', 'bot_events', 'ft_title_description', '(title, description)', 'FULLTEXT'),
+    ]),
+    (5, 'MinHash signatures and LSH buckets for near-duplicate events', [
+        ('column', 'bot_events', 'minhash', 'VARBINARY(256) NULL'),
+        ('sql', """
+            CREATE TABLE IF NOT EXISTS bot_event_lsh (
+                band TINYINT UNSIGNED NOT NULL,
+                bucket BIGINT NOT NULL,
+                event_id INT NOT NULL,
+                PRIMARY KEY (band, bucket, event_id),
+                KEY idx_lsh_event (event_id)
+            )
+        """),
+        ('python', '_backfill_minhashes'),
+    ]),
+    (6, 'Content fingerprints for incremental scraping', [
+        # Left NULL on existing rows: each is rewritten once by its next scrape
+        ('column', 'bot_events', 'content_fingerprint', 'CHAR(40) NULL'),
+    ]),
+    (7, 'Changed-event counts in scraping logs for the adaptive scheduler', [
+        ('column', 'bot_scraping_logs', 'events_changed', 'INT NULL'),
+        ('index', 'bot_scraping_logs', 'idx_source_timestamp', '(source, timestamp)'),
+    ]),
+]
+
+# Seconds get_event_stats serves its cached aggregate before rereading it
+STATS_CACHE_TTL = 10
+
+MIGRATION_LOCK = 'bot_schema_migrations'
+
+# Whether processes create tables and apply migrations when they start; with false,
+# run `python -m EventsSearchBE.migrate` as an explicit deploy step instead
+MIGRATE_ON_STARTUP = os.getenv('DB_MIGRATE_ON_STARTUP', 'true').lower() == 'true'
+
+# Estimated similarity above which LSH candidates are linked as the same event,
+# and how far apart their dates may be (events with a date on both sides)
+NEAR_DUP_THRESHOLD = float(os.getenv('NEAR_DUP_THRESHOLD', 0.6))
+NEAR_DUP_DATE_TOLERANCE_DAYS = int(os.getenv('NEAR_DUP_DATE_TOLERANCE_DAYS', 3))
+
+# Deepest result position /events/search pages may reach
+SEARCH_MAX_RESULTS = int(os.getenv('SEARCH_MAX_RESULTS', 1000))
+
+# Rows fetched per round trip by iter_event_chunks (GET /events/export)
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 500))
+
+# Columns the API returns (binary signatures and fingerprints are internal and
+# would not serialize as JSON); also streamed by /events/export
+EVENT_COLUMNS = ('id', 'title', 'description', 'date', 'location', 'organizer', 'source_url',
+                 'event_type', 'tags', 'image_url', 'source', 'canonical_id', 'created_at', 'updated_at')
+EXPORT_COLUMNS = EVENT_COLUMNS
+
+_UPSERT_COLUMNS = ('title', 'description', 'date', 'location', 'organizer', 'source_url',
+                   'event_type', 'tags', 'image_url', 'title_fingerprint', 'minhash',
+                   'content_fingerprint', 'source')
+
+
+def coerce_date(value) -> Optional[str]:
+    """Normalize a scraped date to YYYY-MM-DD, or None if it cannot be parsed"""
+    if not value:
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.strftime('%Y-%m-%d')
+    text = ' '.join(str(value).split())
+    try:
+        return datetime.fromisoformat(text[:10]).strftime('%Y-%m-%d')
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return None
+
+
+def encode_cursor(created_at, event_id: int) -> str:
+    """Opaque keyset cursor for the (created_at, id) position of an event"""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = f"{created_at}|{event_id}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor from encode_cursor, raising ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        created_at, event_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(event_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Opaque cursor for an offset into a relevance-ranked result list"""
+    return base64.urlsafe_b64encode(f"o|{offset}".encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """Decode a cursor from encode_offset_cursor, raising ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        prefix, offset = raw.split('|', 1)
+        if prefix != 'o' or int(offset) < 0:
+            raise ValueError
+        return int(offset)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+def _format_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse tags JSON and convert datetime columns of a bot_events row to strings"""
+    event['tags'] = json.loads(event['tags']) if event['tags'] else []
+    if event['created_at']:
+        event['created_at'] = event['created_at'].isoformat()
+    if event['updated_at']:
+        event['updated_at'] = event['updated_at'].isoformat()
+    if event['date']:
+        event['date'] = event['date'].isoformat()
+    return event
+
+
+def _clip(value, length: int) -> Optional[str]:
+    return value[:length] if value else None
+
+
+def event_row(event_data: Dict[str, Any], source: str = None) -> Optional[Dict[str, Any]]:
+    """Build bot_events column values for an event, or None if required fields are missing"""
+    if not all(event_data.get(key) for key in ('title', 'organizer', 'event_type')) or event_data.get('source_url') is None:
+        return None
+    title = event_data['title'][:500]
+    event_date = coerce_date(event_data.get('date'))
+    location = _clip(event_data.get('location'), 255)
+    row = {
+        'title': title,
+        'description': event_data.get('description'),
+        'date': event_date,
+        'location': location,
+        'organizer': event_data['organizer'][:255],
+        'source_url': event_data['source_url'][:1000],
+        'event_type': event_data['event_type'][:100],
+        'tags': json.dumps(event_data.get('tags') or []),
+        'image_url': _clip(event_data.get('image_url'), 1000),
+        'title_fingerprint': title_fingerprint(title),
+        'minhash': event_minhash(title, event_date, location),
+        'source': _clip(source, 255)
+    }
+    row['content_fingerprint'] = content_fingerprint(row)
+    return row
+
+
+def dates_compatible(first, second, tolerance_days: int = None) -> bool:
+    """Whether two event dates can describe the same event (missing dates always can)"""
+    if not first or not second:
+        return True
+    tolerance_days = NEAR_DUP_DATE_TOLERANCE_DAYS if tolerance_days is None else tolerance_days
+    first = datetime.strptime(first, '%Y-%m-%d').date() if isinstance(first, str) else first
+    second = datetime.strptime(second, '%Y-%m-%d').date() if isinstance(second, str) else second
+    return abs((first - second).days) <= tolerance_days
+
+
+def _row_key(title: str, organizer: str, source_url: str) -> Tuple[str, str, str]:
+    """Python equivalent of the unique_event key (prefix lengths, case-insensitive collation)"""
+    return (title[:255].casefold(), organizer.casefold(), source_url[:255].casefold())
+
+
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, pool_size: int = None, init_schema: bool = True):
         self.db_config = {
             'host': os.getenv('DB_HOST', 'localhost'),
             'user': os.getenv('DB_USER', 'root'),
@@ -17,17 +255,133 @@ class DatabaseManager:
             'database': os.getenv('DB_NAME', 'innovation_link'),
             'port': int(os.getenv('DB_PORT', 3306))
         }
-        self.init_database()
+        
+        # Pooled mode reuses connections; a size of 0 connects per call
+        if pool_size is None:
+            pool_size = int(os.getenv('DB_POOL_SIZE', 5))
+        self.pool = ConnectionPool(
+            self.db_config,
+            size=pool_size,
+            timeout=float(os.getenv('DB_POOL_TIMEOUT', 30)),
+            ping_interval=float(os.getenv('DB_POOL_PING_INTERVAL', 5))
+        ) if pool_size > 0 else None
+        
+        # Callbacks run after event data is committed (e.g. cache invalidation)
+        self._commit_listeners = []
+        self._stats_cache = None
+        self.schema_version = None
+        
+        # init_schema=False connects lazily; call init_database() later (or not at all)
+        if init_schema:
+            self.init_database()
     
     def get_connection(self):
-        """Get a database connection"""
+        """Get a new, unpooled database connection"""
         return mysql.connector.connect(**self.db_config)
     
+    @contextmanager
+    def connection(self):
+        """Acquire a connection for the duration of a with-block"""
+        if self.pool:
+            with self.pool.connection() as conn:
+                yield conn
+        else:
+            conn = self.get_connection()
+            try:
+                yield conn
+            finally:
+                conn.close()
+    
+    def add_commit_listener(self, callback):
+        """Register a callback to run after events are inserted, updated or deleted"""
+        self._commit_listeners.append(callback)
+    
+    def _notify_commit(self):
+        self._stats_cache = None
+        for callback in self._commit_listeners:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in commit listener: {e}")
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool usage (in use, waiting, created, ...)"""
+        if not self.pool:
+            return {'enabled': False}
+        return dict(self.pool.stats(), enabled=True)
+    
+    def close(self):
+        """Close idle pooled connections"""
+        if self.pool:
+            self.pool.close()
+    
     def init_database(self):
-        """Initialize the database with required tables"""
-        conn = self.get_connection()
+        """Initialize the database with required tables and apply pending migrations"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            self._create_tables(cursor)
+            conn.commit()
+            cursor.close()
+            self.schema_version = self.migrate(conn)
+    
+    def migrate(self, conn) -> int:
+        """Apply pending MIGRATIONS under a server-wide lock and return the schema version"""
         cursor = conn.cursor()
-        
+        cursor.execute("SELECT GET_LOCK(%s, 60)", (MIGRATION_LOCK,))
+        if cursor.fetchone()[0] != 1:
+            raise RuntimeError("Timed out waiting for the schema migration lock")
+        try:
+            cursor.execute("SELECT COALESCE(MAX(version), 0) FROM bot_schema_migrations")
+            version = cursor.fetchone()[0]
+            
+            for target, description, steps in MIGRATIONS:
+                if target <= version:
+                    continue
+                print(f"Applying schema migration {target}: {description}")
+                for step in steps:
+                    self._apply_migration_step(cursor, step)
+                cursor.execute(
+                    "INSERT INTO bot_schema_migrations (version, description) VALUES (%s, %s)",
+                    (target, description)
+                )
+                conn.commit()
+                version = target
+            
+            return version
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+            cursor.fetchone()
+            cursor.close()
+    
+    def _apply_migration_step(self, cursor, step: Tuple):
+        """Apply one migration step, skipping it if already in place"""
+        kind = step[0]
+        if kind == 'index':
+            table, name, columns = step[1:4]
+            index_kind = step[4] if len(step) > 4 else ''
+            cursor.execute("""
+                SELECT COUNT(*) FROM information_schema.statistics
+                WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+            """, (table, name))
+            if cursor.fetchone()[0] == 0:
+                cursor.execute(f"CREATE {index_kind} INDEX {name} ON {table} {columns}")
+        elif kind == 'column':
+            table, name, definition = step[1:4]
+            cursor.execute("""
+                SELECT COUNT(*) FROM information_schema.columns
+                WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+            """, (table, name))
+            if cursor.fetchone()[0] == 0:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+        elif kind == 'sql':
+            cursor.execute(step[1])
+        elif kind == 'python':
+            getattr(self, step[1])(cursor)
+        else:
+            raise ValueError(f"Unknown migration step: {kind}")
+    
+    def _create_tables(self, cursor):
+        """Create the base tables if they do not exist"""
         # Events table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS bot_events (
@@ -59,48 +413,36 @@ class DatabaseManager:
             )
         """)
         
-        conn.commit()
-        cursor.close()
-        conn.close()
+        # Applied schema versions
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS bot_schema_migrations (
+                version INT PRIMARY KEY,
+                description VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
     
-    def insert_event(self, event_data: Dict[str, Any]) -> int:
+    @timed(DB_QUERY_SECONDS, method='insert_event')
+    def insert_event(self, event_data: Dict[str, Any], source: str = None) -> int:
         """Insert a new event into the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        row = event_row(event_data, source)
+        if row is None:
+            raise ValueError("Event needs title, organizer, source_url and event_type")
         
-        tags_json = json.dumps(event_data.get('tags', []))
-        
-        query = """
-            INSERT INTO bot_events 
-            (title, description, date, location, organizer, source_url, event_type, tags, image_url, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-            description = VALUES(description),
-            date = VALUES(date),
-            location = VALUES(location),
-            event_type = VALUES(event_type),
-            tags = VALUES(tags),
-            image_url = VALUES(image_url),
-            updated_at = VALUES(updated_at)
-        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                conn.start_transaction()
+                _, event_id = self._upsert_rows(cursor, [row])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
         
-        cursor.execute(query, (
-            event_data['title'],
-            event_data.get('description'),
-            event_data.get('date'),
-            event_data.get('location'),
-            event_data['organizer'],
-            event_data['source_url'],
-            event_data['event_type'],
-            tags_json,
-            event_data.get('image_url'),
-            datetime.now()
-        ))
-        
-        event_id = cursor.lastrowid
-        conn.commit()
-        cursor.close()
-        conn.close()
+        self._notify_commit()
         return event_id
     
     def add_event(self, title: str, description: str = None, date: str = None, 
@@ -118,101 +460,738 @@ class DatabaseManager:
             'tags': [],
             'image_url': image_url
         }
-        return self.insert_event(event_data)
+        return self.insert_event(event_data, source=source)
+    
+    @timed(DB_QUERY_SECONDS, method='insert_events_batch')
+    def insert_events_batch(self, events: List[Dict[str, Any]], source: str = None) -> Dict[str, int]:
+        """Upsert many events with multi-row INSERT ... ON DUPLICATE KEY UPDATE in one transaction
+        
+        Returns counts of inserted, updated and unchanged rows, plus events
+        skipped for missing required fields. Events repeating the same
+        unique key within the batch are collapsed, keeping the last one.
+        source is the scraper the events came from.
+        """
+        rows = {}
+        skipped = 0
+        for event_data in events:
+            row = event_row(event_data, source)
+            if row is None:
+                skipped += 1
+                continue
+            rows[_row_key(row['title'], row['organizer'], row['source_url'])] = row
+        
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': skipped}
+        if not rows:
+            return counts
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                conn.start_transaction()
+                upserted, _ = self._upsert_rows(cursor, list(rows.values()))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+        
+        self._notify_commit()
+        counts.update(upserted)
+        return counts
+    
+    @timed(DB_QUERY_SECONDS, method='sync_source_events')
+    def sync_source_events(self, events: List[Dict[str, Any]], source: str) -> Dict[str, int]:
+        """Write only the events of a source that are new or whose content changed
+        
+        Each event's content fingerprint is compared with the ones stored for
+        source, so unchanged rows are not rewritten (and keep their
+        updated_at). Returns counts of new, changed and unchanged events,
+        stored events of the source missing from this scrape (disappeared;
+        they are kept), and events skipped for missing required fields.
+        """
+        rows = {}
+        skipped = 0
+        for event_data in events:
+            row = event_row(event_data, source)
+            if row is None:
+                skipped += 1
+                continue
+            rows[_row_key(row['title'], row['organizer'], row['source_url'])] = row
+        
+        stored = self.get_content_fingerprints(source)
+        counts = {'new': 0, 'changed': 0, 'unchanged': 0, 'disappeared': 0, 'skipped': skipped}
+        pending = []
+        for key, row in rows.items():
+            if key not in stored:
+                counts['new'] += 1
+            elif stored[key] != row['content_fingerprint']:
+                counts['changed'] += 1
+            else:
+                counts['unchanged'] += 1
+                continue
+            pending.append(row)
+        counts['disappeared'] = len(stored.keys() - rows.keys())
+        if not pending:
+            return counts
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                conn.start_transaction()
+                self._upsert_rows(cursor, pending)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+        
+        self._notify_commit()
+        return counts
+    
+    @timed(DB_QUERY_SECONDS, method='get_content_fingerprints')
+    def get_content_fingerprints(self, source: str) -> Dict[Tuple[str, str, str], Optional[str]]:
+        """Stored content fingerprint per unique event key for one source (one idx_source scan)"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT title, organizer, source_url, content_fingerprint FROM bot_events WHERE source = %s",
+                (source,)
+            )
+            rows = cursor.fetchall()
+            cursor.close()
+        return {_row_key(title, organizer, source_url): fingerprint
+                for title, organizer, source_url, fingerprint in rows}
+    
+    def _upsert_rows(self, cursor, rows: List[Dict[str, Any]]) -> Tuple[Dict[str, int], int]:
+        """Upsert event rows inside the caller's transaction
+        
+        Keeps title and near-duplicate links and the bot_event_counts
+        aggregate in step with the change. Returns inserted/updated/unchanged counts and
+        the last inserted id.
+        """
+        placeholders = '(' + ', '.join(['%s'] * len(_UPSERT_COLUMNS)) + ')'
+        # updated_at is left to ON UPDATE CURRENT_TIMESTAMP so rows whose values
+        # did not change are reported unchanged (affected rows: 1 insert, 2 update, 0 same)
+        upsert = f"""
+            INSERT INTO bot_events ({', '.join(_UPSERT_COLUMNS)})
+            VALUES {{values}}
+            ON DUPLICATE KEY UPDATE
+            description = VALUES(description),
+            date = VALUES(date),
+            location = VALUES(location),
+            event_type = VALUES(event_type),
+            tags = VALUES(tags),
+            image_url = VALUES(image_url),
+            minhash = VALUES(minhash),
+            content_fingerprint = VALUES(content_fingerprint),
+            source = COALESCE(VALUES(source), source)
+        """
+        
+        existing = {}
+        near_dup_ids = []
+        affected = 0
+        last_id = 0
+        for start in range(0, len(rows), BATCH_CHUNK_SIZE):
+            chunk = rows[start:start + BATCH_CHUNK_SIZE]
+            
+            key_filter = "(title, organizer, source_url) IN (" + ', '.join(['(%s, %s, %s)'] * len(chunk)) + ")"
+            cursor.execute(
+                "SELECT title, organizer, source_url, event_type, source, minhash FROM bot_events "
+                "WHERE " + key_filter + " FOR UPDATE",
+                [row[column] for row in chunk for column in ('title', 'organizer', 'source_url')]
+            )
+            for title, organizer, source_url, event_type, source, minhash in cursor.fetchall():
+                existing[_row_key(title, organizer, source_url)] = (event_type, source, minhash)
+            
+            cursor.execute(
+                upsert.format(values=', '.join([placeholders] * len(chunk))),
+                [row[column] for row in chunk for column in _UPSERT_COLUMNS]
+            )
+            affected += cursor.rowcount
+            last_id = cursor.lastrowid or last_id
+            
+            # New rows and rows whose signature changed need a near-duplicate check
+            changed = [row for row in chunk if row['minhash'] and (
+                existing.get(_row_key(row['title'], row['organizer'], row['source_url'])) or (None, None, None)
+            )[2] != row['minhash']]
+            if changed:
+                cursor.execute(
+                    "SELECT id FROM bot_events WHERE (title, organizer, source_url) IN ("
+                    + ', '.join(['(%s, %s, %s)'] * len(changed)) + ")",
+                    [row[column] for row in changed for column in ('title', 'organizer', 'source_url')]
+                )
+                near_dup_ids.extend(event_id for (event_id,) in cursor.fetchall())
+        
+        # Aggregate deltas: +1 for new rows, moves for rows whose type or source changed
+        deltas = Counter()
+        for row in rows:
+            previous = existing.get(_row_key(row['title'], row['organizer'], row['source_url']))
+            if previous is None:
+                deltas[('total', '')] += 1
+                deltas[('type', row['event_type'])] += 1
+                if row['source']:
+                    deltas[('source', row['source'])] += 1
+                continue
+            old_type, old_source, _ = previous
+            if old_type != row['event_type']:
+                deltas[('type', old_type)] -= 1
+                deltas[('type', row['event_type'])] += 1
+            if row['source'] and old_source != row['source']:
+                if old_source:
+                    deltas[('source', old_source)] -= 1
+                deltas[('source', row['source'])] += 1
+        self._apply_count_deltas(cursor, deltas)
+        
+        self._link_title_duplicates(cursor, list({row['title_fingerprint'] for row in rows if row['title_fingerprint']}))
+        self._link_near_duplicates(cursor, near_dup_ids)
+        
+        inserted = len(rows) - len(existing)
+        updated = max(0, (affected - inserted) // 2)
+        return {'inserted': inserted, 'updated': updated, 'unchanged': len(existing) - updated}, last_id
+    
+    def _apply_count_deltas(self, cursor, deltas: Counter):
+        """Add deltas keyed by (dimension, name) to bot_event_counts"""
+        values = [(dimension, name[:255], delta) for (dimension, name), delta in deltas.items() if delta]
+        if not values:
+            return
+        cursor.execute(
+            "INSERT INTO bot_event_counts (dimension, name, events) VALUES "
+            + ', '.join(['(%s, %s, %s)'] * len(values))
+            + " ON DUPLICATE KEY UPDATE events = events + VALUES(events)",
+            [value for row in values for value in row]
+        )
+    
+    def _rebuild_event_counts(self, cursor):
+        """Recompute bot_event_counts from bot_events (migration step and repair)"""
+        cursor.execute("DELETE FROM bot_event_counts")
+        cursor.execute("""
+            INSERT INTO bot_event_counts (dimension, name, events)
+            SELECT 'total', '', COUNT(*) FROM bot_events
+            UNION ALL
+            SELECT 'type', event_type, COUNT(*) FROM bot_events GROUP BY event_type
+            UNION ALL
+            SELECT 'source', source, COUNT(*) FROM bot_events WHERE source IS NOT NULL GROUP BY source
+        """)
+    
+    @timed(DB_QUERY_SECONDS, method='rebuild_event_counts')
+    def rebuild_event_counts(self):
+        """Recompute the event count aggregate from scratch"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                conn.start_transaction()
+                self._rebuild_event_counts(cursor)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+        self._stats_cache = None
+    
+    def _link_title_duplicates(self, cursor, fingerprints: List[str] = None):
+        """Point every row sharing a title fingerprint at the canonical event of the oldest such row
+        
+        Canonical rows keep canonical_id NULL. When the oldest row is itself
+        linked as a near-duplicate, the others point at its canonical row
+        instead, so canonical_id never forms a chain. Only non-canonical rows
+        are written, so a canonical row is never unlinked by this pass.
+        """
+        query = """
+            UPDATE bot_events e
+            JOIN (
+                SELECT title_fingerprint, MIN(id) AS oldest_id
+                FROM bot_events
+                WHERE title_fingerprint {condition}
+                GROUP BY title_fingerprint
+                HAVING COUNT(*) > 1
+            ) c ON e.title_fingerprint = c.title_fingerprint
+            JOIN bot_events root ON root.id = c.oldest_id
+            SET e.canonical_id = COALESCE(root.canonical_id, root.id)
+            WHERE e.id <> c.oldest_id
+              AND e.id <> COALESCE(root.canonical_id, root.id)
+              AND NOT (e.canonical_id <=> COALESCE(root.canonical_id, root.id))
+        """
+        if fingerprints is None:
+            cursor.execute(query.format(condition="IS NOT NULL"))
+            return
+        for start in range(0, len(fingerprints), BATCH_CHUNK_SIZE):
+            chunk = fingerprints[start:start + BATCH_CHUNK_SIZE]
+            cursor.execute(query.format(condition="IN (" + ', '.join(['%s'] * len(chunk)) + ")"), chunk)
+    
+    def _backfill_title_fingerprints(self, cursor):
+        """Migration step: fingerprint existing titles and link their duplicates"""
+        last_id = 0
+        while True:
+            cursor.execute("""
+                SELECT id, title FROM bot_events
+                WHERE id > %s AND title_fingerprint IS NULL
+                ORDER BY id LIMIT %s
+            """, (last_id, BATCH_CHUNK_SIZE))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            cursor.executemany(
+                "UPDATE bot_events SET title_fingerprint = %s WHERE id = %s",
+                [(title_fingerprint(title), event_id) for event_id, title in rows]
+            )
+            last_id = rows[-1][0]
+        self._link_title_duplicates(cursor)
+    
+    def _link_near_duplicates(self, cursor, event_ids: List[int]):
+        """Link canonical rows among event_ids to an older near-duplicate canonical row
+        
+        Candidates come from the bot_event_lsh band buckets (one indexed
+        lookup per band, independent of table size) and are confirmed by
+        MinHash similarity and a date check; the most similar, then oldest,
+        match becomes the canonical event and rows that pointed at the
+        linked row follow it. Rows that stay canonical are (re)added to the
+        buckets, which only ever hold canonical rows. Pass ids in ascending
+        order across calls so older events are indexed first.
+        """
+        event_ids = sorted(set(event_ids))
+        for start in range(0, len(event_ids), BATCH_CHUNK_SIZE):
+            chunk = event_ids[start:start + BATCH_CHUNK_SIZE]
+            id_list = ', '.join(['%s'] * len(chunk))
+            cursor.execute(
+                f"SELECT id, minhash, date FROM bot_events WHERE id IN ({id_list}) "
+                f"AND canonical_id IS NULL AND minhash IS NOT NULL ORDER BY id",
+                chunk
+            )
+            rows = cursor.fetchall()
+            # Drop buckets from earlier signatures of these rows
+            cursor.execute(f"DELETE FROM bot_event_lsh WHERE event_id IN ({id_list})", chunk)
+            if not rows:
+                continue
+            
+            row_buckets = {event_id: lsh_buckets(signature) for event_id, signature, _ in rows}
+            bucket_ids = defaultdict(set)
+            wanted = list(set().union(*row_buckets.values()))
+            for part in range(0, len(wanted), BATCH_CHUNK_SIZE):
+                keys = wanted[part:part + BATCH_CHUNK_SIZE]
+                cursor.execute(
+                    "SELECT band, bucket, event_id FROM bot_event_lsh WHERE (band, bucket) IN ("
+                    + ', '.join(['(%s, %s)'] * len(keys)) + ")",
+                    [value for key in keys for value in key]
+                )
+                for band, bucket, other_id in cursor.fetchall():
+                    bucket_ids[(band, bucket)].add(other_id)
+            
+            known = {event_id: (signature, event_date) for event_id, signature, event_date in rows}
+            others = list(set().union(*bucket_ids.values()) - set(known)) if bucket_ids else []
+            for part in range(0, len(others), BATCH_CHUNK_SIZE):
+                ids = others[part:part + BATCH_CHUNK_SIZE]
+                cursor.execute(
+                    "SELECT id, minhash, date FROM bot_events WHERE id IN ("
+                    + ', '.join(['%s'] * len(ids)) + ") AND canonical_id IS NULL AND minhash IS NOT NULL",
+                    ids
+                )
+                for other_id, signature, event_date in cursor.fetchall():
+                    known[other_id] = (signature, event_date)
+            
+            links = {}
+            lsh_rows = []
+            for event_id, signature, event_date in rows:
+                best = None
+                candidates = set().union(*(bucket_ids.get(key, ()) for key in row_buckets[event_id]))
+                for other_id in candidates:
+                    if other_id >= event_id or other_id in links or other_id not in known:
+                        continue
+                    other_signature, other_date = known[other_id]
+                    if not dates_compatible(event_date, other_date):
+                        continue
+                    similarity = signature_similarity(signature, other_signature)
+                    if similarity >= NEAR_DUP_THRESHOLD and (best is None or (similarity, -other_id) > (best[0], -best[1])):
+                        best = (similarity, other_id)
+                if best:
+                    links[event_id] = best[1]
+                    continue
+                for key in row_buckets[event_id]:
+                    bucket_ids[key].add(event_id)
+                    lsh_rows.append((key[0], key[1], event_id))
+            
+            if links:
+                cursor.executemany(
+                    "UPDATE bot_events SET canonical_id = %s WHERE id = %s OR canonical_id = %s",
+                    [(canonical_id, event_id, event_id) for event_id, canonical_id in links.items()]
+                )
+            for part in range(0, len(lsh_rows), BATCH_CHUNK_SIZE):
+                values = lsh_rows[part:part + BATCH_CHUNK_SIZE]
+                cursor.execute(
+                    "INSERT IGNORE INTO bot_event_lsh (band, bucket, event_id) VALUES "
+                    + ', '.join(['(%s, %s, %s)'] * len(values)),
+                    [value for row in values for value in row]
+                )
+    
+    def _backfill_minhashes(self, cursor):
+        """Migration step: sign existing events, then link near-duplicates oldest first"""
+        last_id = 0
+        while True:
+            cursor.execute("""
+                SELECT id, title, date, location FROM bot_events
+                WHERE id > %s AND minhash IS NULL
+                ORDER BY id LIMIT %s
+            """, (last_id, BATCH_CHUNK_SIZE))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            cursor.executemany(
+                "UPDATE bot_events SET minhash = %s WHERE id = %s",
+                [(event_minhash(title, event_date, location), event_id)
+                 for event_id, title, event_date, location in rows]
+            )
+            last_id = rows[-1][0]
+        
+        last_id = 0
+        while True:
+            cursor.execute("""
+                SELECT id FROM bot_events
+                WHERE id > %s AND canonical_id IS NULL
+                ORDER BY id LIMIT %s
+            """, (last_id, BATCH_CHUNK_SIZE))
+            ids = [event_id for (event_id,) in cursor.fetchall()]
+            if not ids:
+                break
+            self._link_near_duplicates(cursor, ids)
+            last_id = ids[-1]
     
     def get_events(self, limit: int = 50, event_type: str = None) -> List[Dict[str, Any]]:
         """Retrieve events from the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor(dictionary=True)
+        events, _ = self.get_events_page(limit=limit, event_type=event_type)
+        return events
+    
+    @timed(DB_QUERY_SECONDS, method='get_events_page')
+    def get_events_page(self, limit: int = 50, event_type: str = None,
+                        cursor: Tuple[datetime, int] = None,
+                        canonical_only: bool = False) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Retrieve one keyset page of events, newest first, and the cursor for the next page
         
-        query = "SELECT * FROM bot_events"
+        Pages are ordered by (created_at, id) descending, so each page is an
+        index range scan that starts right after the cursor position no
+        matter how deep it is. next_cursor is None on the last page.
+        canonical_only skips rows linked to an earlier event with the same
+        normalized title or a near-duplicate signature.
+        """
+        query = f"SELECT {', '.join(EVENT_COLUMNS)} FROM bot_events"
+        conditions = []
         params = []
         
+        if canonical_only:
+            conditions.append("canonical_id IS NULL")
+        
         if event_type:
-            query += " WHERE event_type = %s"
+            conditions.append("event_type = %s")
             params.append(event_type)
         
-        query += " ORDER BY created_at DESC LIMIT %s"
-        params.append(limit)
+        if cursor:
+            created_at, event_id = cursor
+            conditions.append("(created_at < %s OR (created_at = %s AND id < %s))")
+            params.extend([created_at, created_at, event_id])
+        
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        
+        # One extra row tells whether another page exists
+        query += " ORDER BY created_at DESC, id DESC LIMIT %s"
+        params.append(limit + 1)
         
-        cursor.execute(query, params)
-        events = cursor.fetchall()
+        with self.connection() as conn:
+            db_cursor = conn.cursor(dictionary=True)
+            db_cursor.execute(query, params)
+            events = db_cursor.fetchall()
+            db_cursor.close()
+        
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            next_cursor = encode_cursor(events[-1]['created_at'], events[-1]['id'])
+        
+        return [_format_event(event) for event in events], next_cursor
+    
+    def iter_event_chunks(self, event_type: str = None, canonical_only: bool = False,
+                          chunk_size: int = None) -> Iterator[List[Dict[str, Any]]]:
+        """Yield all matching events in id order, chunk_size formatted rows at a time
+        
+        Rows come from an unbuffered cursor, so only one chunk is held in
+        memory however large the table is. A pooled connection stays checked
+        out until the generator is exhausted or closed; a consumer that stops
+        early leaves the result unread and the pool discards the connection.
+        """
+        chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+        query = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM bot_events"
+        conditions = []
+        params = []
+        if canonical_only:
+            conditions.append("canonical_id IS NULL")
+        if event_type:
+            conditions.append("event_type = %s")
+            params.append(event_type)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id"
+        
+        with self.connection() as conn:
+            db_cursor = conn.cursor(dictionary=True, buffered=False)
+            db_cursor.execute(query, params)
+            while True:
+                rows = db_cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield [_format_event(row) for row in rows]
+            db_cursor.close()
+    
+    @timed(DB_QUERY_SECONDS, method='search_events')
+    def search_events(self, query: str, limit: int = 20, event_type: str = None,
+                      offset: int = 0) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Full-text search over title and description, best matches first
+        
+        Uses the ft_title_description index in natural language mode, so
+        only matching rows are scored and the cost follows the number of
+        matches rather than the table size. Only canonical rows are
+        returned. Results are paged by offset up to SEARCH_MAX_RESULTS;
+        next_cursor is None on the last page.
+        """
+        limit = max(0, min(limit, SEARCH_MAX_RESULTS - offset))
+        if limit == 0:
+            return [], None
+        
+        conditions = ["MATCH(title, description) AGAINST (%s IN NATURAL LANGUAGE MODE)",
+                      "canonical_id IS NULL"]
+        params = [query, query]
+        if event_type:
+            conditions.append("event_type = %s")
+            params.append(event_type)
+        params.extend([limit + 1, offset])
+        
+        with self.connection() as conn:
+            db_cursor = conn.cursor(dictionary=True)
+            db_cursor.execute(f"""
+                SELECT {', '.join(EVENT_COLUMNS)},
+                       MATCH(title, description) AGAINST (%s IN NATURAL LANGUAGE MODE) AS relevance
+                FROM bot_events
+                WHERE {' AND '.join(conditions)}
+                ORDER BY relevance DESC, id DESC
+                LIMIT %s OFFSET %s
+            """, params)
+            events = db_cursor.fetchall()
+            db_cursor.close()
+        
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            if offset + limit < SEARCH_MAX_RESULTS:
+                next_cursor = encode_offset_cursor(offset + limit)
         
-        # Parse tags JSON and convert datetime objects to strings
         for event in events:
-            event['tags'] = json.loads(event['tags']) if event['tags'] else []
-            if event['created_at']:
-                event['created_at'] = event['created_at'].isoformat()
-            if event['updated_at']:
-                event['updated_at'] = event['updated_at'].isoformat()
-            if event['date']:
-                event['date'] = event['date'].isoformat()
-        
-        cursor.close()
-        conn.close()
-        return events
+            event['relevance'] = round(float(event['relevance']), 4)
+        return [_format_event(event) for event in events], next_cursor
     
-    def log_scraping_result(self, source: str, events_found: int, success: bool, error_message: str = None):
-        """Log scraping results"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    @timed(DB_QUERY_SECONDS, method='get_suggestion_rows')
+    def get_suggestion_rows(self, before_id: int = None, after_id: int = None,
+                            limit: int = 1000) -> List[Dict[str, Any]]:
+        """Id, title and organizer of canonical events for the typeahead index
         
-        cursor.execute("""
-            INSERT INTO bot_scraping_logs (source, events_found, success, error_message)
-            VALUES (%s, %s, %s, %s)
-        """, (source, events_found, success, error_message))
+        With before_id, rows are returned newest first below that id (for the
+        initial build); with after_id, oldest first above it (for catching up
+        after an ingest). Each call is one primary-key range scan.
+        """
+        query = "SELECT id, title, organizer FROM bot_events WHERE canonical_id IS NULL"
+        params = []
+        if after_id is not None:
+            query += " AND id > %s ORDER BY id ASC"
+            params.append(after_id)
+        else:
+            if before_id is not None:
+                query += " AND id < %s"
+                params.append(before_id)
+            query += " ORDER BY id DESC"
+        query += " LIMIT %s"
+        params.append(limit)
+        
+        with self.connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.close()
+        return rows
+    
+    @timed(DB_QUERY_SECONDS, method='log_scraping_result')
+    def log_scraping_result(self, source: str, events_found: int, success: bool, error_message: str = None,
+                            events_changed: int = None):
+        """Log scraping results and update the source's last-run summary
         
-        conn.commit()
-        cursor.close()
-        conn.close()
+        events_changed is how many events the run added, changed or saw
+        disappear (0 for unchanged pages); the scheduler adapts to it.
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                conn.start_transaction()
+                cursor.execute("""
+                    INSERT INTO bot_scraping_logs (source, events_found, success, error_message, events_changed)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, (source, events_found, success, error_message, events_changed))
+                cursor.execute("""
+                    INSERT INTO bot_source_runs
+                    (source, last_run_at, last_success, last_events_found, last_error, runs, failures)
+                    VALUES (%s, NOW(), %s, %s, %s, 1, %s)
+                    ON DUPLICATE KEY UPDATE
+                    last_run_at = VALUES(last_run_at),
+                    last_success = VALUES(last_success),
+                    last_events_found = VALUES(last_events_found),
+                    last_error = VALUES(last_error),
+                    runs = runs + 1,
+                    failures = failures + VALUES(failures)
+                """, (source, success, events_found, error_message, 0 if success else 1))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+        self._stats_cache = None
+    
+    @timed(DB_QUERY_SECONDS, method='get_scrape_history')
+    def get_scrape_history(self, days: int = 14) -> Dict[str, List[Dict[str, Any]]]:
+        """Timestamp, success and events_changed of each source's logged runs, oldest first"""
+        with self.connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT source, timestamp, success, events_changed FROM bot_scraping_logs
+                WHERE timestamp >= NOW() - INTERVAL %s DAY
+                ORDER BY source, timestamp
+            """, (days,))
+            rows = cursor.fetchall()
+            cursor.close()
+        history = defaultdict(list)
+        for row in rows:
+            history[row.pop('source')].append(row)
+        return dict(history)
     
+    @timed(DB_QUERY_SECONDS, method='get_scraping_logs')
     def get_scraping_logs(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get recent scraping logs"""
-        conn = self.get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute("""
-            SELECT * FROM bot_scraping_logs 
-            ORDER BY timestamp DESC 
-            LIMIT %s
-        """, (limit,))
-        
-        logs = cursor.fetchall()
+        with self.connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT * FROM bot_scraping_logs 
+                ORDER BY timestamp DESC 
+                LIMIT %s
+            """, (limit,))
+            logs = cursor.fetchall()
+            cursor.close()
         
         # Convert datetime objects to strings
         for log in logs:
             if log['timestamp']:
                 log['timestamp'] = log['timestamp'].isoformat()
         
-        cursor.close()
-        conn.close()
         return logs
     
+    @timed(DB_QUERY_SECONDS, method='get_event_count')
     def get_event_count(self) -> int:
-        """Get total number of events"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        """Get total number of events (from the maintained aggregate)"""
+        return self.get_event_stats()['total_events']
+    
+    @timed(DB_QUERY_SECONDS, method='get_event_stats')
+    def get_event_stats(self) -> Dict[str, Any]:
+        """Event counts per type and per source plus each source's last run
+        
+        Reads the small aggregate tables maintained at ingest, so the cost
+        does not depend on the size of bot_events. Cached for
+        STATS_CACHE_TTL seconds and dropped when this process commits.
+        """
+        cached = self._stats_cache
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
+        with self.connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT dimension, name, events FROM bot_event_counts WHERE events <> 0")
+            counts = cursor.fetchall()
+            cursor.execute("SELECT * FROM bot_source_runs ORDER BY source")
+            runs = cursor.fetchall()
+            cursor.close()
         
-        cursor.execute("SELECT COUNT(*) FROM bot_events")
-        count = cursor.fetchone()[0]
+        stats = {'total_events': 0, 'by_type': {}, 'by_source': {}, 'sources': {}, 'last_updated': None}
+        for row in counts:
+            if row['dimension'] == 'total':
+                stats['total_events'] = row['events']
+            else:
+                stats['by_' + row['dimension']][row['name']] = row['events']
+        for run in runs:
+            last_run_at = run['last_run_at'].isoformat() if run['last_run_at'] else None
+            stats['sources'][run['source']] = {
+                'last_run_at': last_run_at,
+                'last_success': bool(run['last_success']),
+                'last_events_found': run['last_events_found'],
+                'last_error': run['last_error'],
+                'runs': run['runs'],
+                'failures': run['failures']
+            }
+            if last_run_at and (stats['last_updated'] is None or last_run_at > stats['last_updated']):
+                stats['last_updated'] = last_run_at
         
-        cursor.close()
-        conn.close()
-        return count
+        self._stats_cache = (time.monotonic() + STATS_CACHE_TTL, stats)
+        return stats
     
+    @timed(DB_QUERY_SECONDS, method='cleanup_old_events')
     def cleanup_old_events(self, days: int = 365):
         """Remove events older than specified days"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            DELETE FROM bot_events 
-            WHERE created_at < DATE_SUB(NOW(), INTERVAL %s DAY)
-        """, (days,))
-        
-        deleted_count = cursor.rowcount
-        conn.commit()
-        cursor.close()
-        conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                conn.start_transaction()
+                cursor.execute("""
+                    SELECT event_type, source, COUNT(*) FROM bot_events
+                    WHERE created_at < DATE_SUB(NOW(), INTERVAL %s DAY)
+                    GROUP BY event_type, source
+                    FOR UPDATE
+                """, (days,))
+                deltas = Counter()
+                for event_type, source, count in cursor.fetchall():
+                    deltas[('total', '')] -= count
+                    deltas[('type', event_type)] -= count
+                    if source:
+                        deltas[('source', source)] -= count
+            
+                cursor.execute("""
+                    DELETE FROM bot_events 
+                    WHERE created_at < DATE_SUB(NOW(), INTERVAL %s DAY)
+                """, (days,))
+                deleted_count = cursor.rowcount
+                self._apply_count_deltas(cursor, deltas)
+            
+                if deleted_count:
+                    # Rows whose canonical event was deleted become canonical again, then get relinked
+                    cursor.execute("""
+                        SELECT e.id FROM bot_events e
+                        LEFT JOIN bot_events c ON c.id = e.canonical_id
+                        WHERE e.canonical_id IS NOT NULL AND c.id IS NULL
+                    """)
+                    orphaned = [event_id for (event_id,) in cursor.fetchall()]
+                    cursor.execute("""
+                        UPDATE bot_events e
+                        LEFT JOIN bot_events c ON c.id = e.canonical_id
+                        SET e.canonical_id = NULL
+                        WHERE e.canonical_id IS NOT NULL AND c.id IS NULL
+                    """)
+                    cursor.execute("""
+                        DELETE l FROM bot_event_lsh l
+                        LEFT JOIN bot_events e ON e.id = l.event_id
+                        WHERE e.id IS NULL
+                    """)
+                    self._link_title_duplicates(cursor)
+                    self._link_near_duplicates(cursor, orphaned)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
         
-        return deleted_count
\ No newline at end of file
+        if deleted_count:
+            self._notify_commit()
+        return deleted_count
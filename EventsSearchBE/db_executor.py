@@ -0,0 +1,52 @@
+"""
+Bounded thread pool for blocking DatabaseManager calls made from async handlers
+Keeps mysql.connector round trips off the event loop so concurrent requests overlap their I/O
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class BlockingExecutor:
+    """Runs blocking callables on a fixed number of threads and awaits their results
+
+    Sized like the connection pool: more threads would only wait inside
+    pool checkout, while calls beyond the limit queue here without holding
+    the event loop or a connection.
+    """
+
+    def __init__(self, workers: int, name: str = 'db'):
+        self.workers = max(1, workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Call func(*args, **kwargs) on a worker thread and return its result"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Worker count, calls running or queued, and calls completed"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'in_flight': self._in_flight,
+                'queued': max(0, self._in_flight - self.workers),
+                'completed': self._completed
+            }
+
+    def close(self):
+        """Stop accepting calls and drop queued ones; running calls finish in the background"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
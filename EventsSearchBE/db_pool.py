@@ -0,0 +1,166 @@
+"""
+Connection pool for DatabaseManager
+Bounded set of reusable mysql.connector connections with health checks on checkout
+"""
+
+import collections
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict
+
+import mysql.connector
+from mysql.connector.errors import PoolError
+
+
+class ConnectionPool:
+    """Thread-safe bounded pool; callers block (up to timeout) when all connections are in use
+
+    Pooled connections run in autocommit mode so an idle connection never
+    holds a stale transaction snapshot; multi-statement writes start an
+    explicit transaction. Connections idle longer than ping_interval are
+    pinged on checkout and replaced if the server dropped them.
+    """
+
+    def __init__(self, db_config: Dict[str, Any], size: int = 5, timeout: float = 30,
+                 ping_interval: float = 5):
+        self.db_config = db_config
+        self.size = size
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+
+        self._cond = threading.Condition()
+        self._idle = collections.deque()  # (connection, released_at)
+        self._open = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._created = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._health_failures = 0
+
+    def _connect(self):
+        conn = mysql.connector.connect(**self.db_config)
+        conn.autocommit = True
+        with self._cond:
+            self._created += 1
+        return conn
+
+    def _healthy(self, conn, idle_for: float) -> bool:
+        if idle_for < self.ping_interval:
+            return True
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout: float = None):
+        """Check out a connection, creating one if the pool is below size"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    conn, released_at = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolError(f"No connection available within {timeout}s (pool size {self.size})")
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+        try:
+            if conn is not None and not self._healthy(conn, time.monotonic() - released_at):
+                with self._cond:
+                    self._health_failures += 1
+                self._close_quietly(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._in_use += 1
+            self._checkouts += 1
+        return conn
+
+    def release(self, conn, discard: bool = False):
+        """Return a connection to the pool, rolling back anything left open"""
+        if not discard:
+            try:
+                if conn.unread_result:
+                    # An unbuffered result abandoned part way; draining it could read a whole table
+                    discard = True
+                elif conn.in_transaction:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._open -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+        if discard:
+            self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self):
+        """Context-managed checkout; connections that raised a driver error are discarded"""
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError):
+            discard = True
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def stats(self) -> Dict[str, int]:
+        """Current usage and lifetime counters"""
+        with self._cond:
+            return {
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'waiting': self._waiting,
+                'created': self._created,
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'health_check_failures': self._health_failures
+            }
+
+    def close(self):
+        """Close all idle connections"""
+        with self._cond:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._open -= len(idle)
+        for conn in idle:
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,395 @@
+"""
+Declarative extraction engine for listing pages
+A source is described by a spec (a plain dict): the pages to fetch, container
+selectors for the event cards, and per-field selectors, regexes and fallbacks.
+compile_spec() turns selectors and regexes into matchers once; extraction then
+walks the page once to find the cards and each card once to fill its fields.
+
+Spec keys:
+    source       source name
+    urls         pages tried in order; the first that yields events wins
+    containers   selectors for the cards, tried in order: the first one that
+                 matches anything is used; cards nested in a card are skipped
+    fields       {name: field spec}, evaluated in order (see below)
+    constants    values copied into every event
+    limit        cards examined per page (default: all)
+    max_events   events kept per scrape (default: all)
+    unique_titles drop events whose title normalizes like an earlier one
+    fetch        extra keyword arguments for the page fetch (e.g. timeout)
+
+Field spec keys:
+    select       selectors tried in order within the card (omit for the card
+                 itself); the first element in document order matching the
+                 earliest selector wins
+    from         match against an earlier field's extracted value (not its default)
+    siblings     join the text of up to this many following siblings of the
+                 card, stopping at an element matching 'until'
+    attr         'text' (default), an attribute name, or a list tried in order
+    patterns     regexes tried in order; the first match (or its 'group') is the
+                 value, and no match leaves the field empty ('ignore_case': True
+                 compiles them with re.I)
+    transform    name from TRANSFORMS applied to the value
+    min_length / max_length
+    required     drop the card when the field ends up empty
+    keywords     drop the card unless the value contains one of these
+    exclude      drop the card if the value contains one of these
+    default      value used when the field ends up empty; '{page_url}' in it
+                 is replaced by the URL of the page being extracted
+
+Selectors are a CSS subset without combinators: tag, *, .class, #id,
+[attr], [attr=v], [attr~=v], [attr^=v], [attr$=v], [attr*=v] (an 'i' flag
+makes the comparison case-insensitive), and comma-separated alternatives.
+"""
+
+import re
+import urllib.parse
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from bs4 import Tag
+
+from fingerprints import unique_by_title
+from http_client import get_http_client
+from page_cache import PageUnchanged, get_page_cache
+from parsing import make_soup
+
+Matcher = Callable[[Tag], bool]
+
+_COMPOUND_RE = re.compile(r'(?P<tag>[A-Za-z][\w-]*|\*)?(?P<rest>(?:\.[\w-]+|#[\w-]+|\[[^\]]*\])*)')
+_PART_RE = re.compile(
+    r'\.(?P<cls>[\w-]+)|#(?P<id>[\w-]+)'
+    r'|\[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[~^$*]?=)\s*(?P<value>"[^"]*"|\'[^\']*\'|[^\s\]]+)\s*(?P<flag>[iI])?)?\s*\]'
+)
+
+_ATTR_TESTS = {
+    '=': lambda actual, expected: actual == expected,
+    '~=': lambda actual, expected: expected in actual.split(),
+    '^=': lambda actual, expected: actual.startswith(expected),
+    '$=': lambda actual, expected: actual.endswith(expected),
+    '*=': lambda actual, expected: expected in actual,
+}
+
+
+def _compile_compound(selector: str) -> Matcher:
+    """Matcher for one compound selector such as div[class*=event i]"""
+    match = _COMPOUND_RE.fullmatch(selector)
+    if not match or not selector:
+        raise ValueError(f"Unsupported selector {selector!r}: only tag, class, id and attribute selectors without combinators")
+    name = match.group('tag')
+    name = None if name in (None, '*') else name.lower()
+
+    checks = []
+    for part in _PART_RE.finditer(match.group('rest')):
+        if part.group('cls'):
+            checks.append(('class', _ATTR_TESTS['~='], part.group('cls'), False))
+        elif part.group('id'):
+            checks.append(('id', _ATTR_TESTS['='], part.group('id'), False))
+        else:
+            value = part.group('value')
+            if value and value[0] in '"\'':
+                value = value[1:-1]
+            ignore_case = bool(part.group('flag'))
+            test = _ATTR_TESTS[part.group('op')] if part.group('op') else None
+            checks.append((part.group('attr').lower(), test, value.lower() if ignore_case else value, ignore_case))
+    if sum(len(part.group(0)) for part in _PART_RE.finditer(match.group('rest'))) != len(match.group('rest')):
+        raise ValueError(f"Unsupported selector {selector!r}: only tag, class, id and attribute selectors without combinators")
+
+    def matches(tag: Tag) -> bool:
+        if name is not None and tag.name != name:
+            return False
+        attrs = tag.attrs
+        for attr, test, expected, ignore_case in checks:
+            actual = attrs.get(attr)
+            if actual is None:
+                return False
+            if test is None:
+                continue
+            if isinstance(actual, list):
+                actual = ' '.join(actual)
+            if not test(actual.lower() if ignore_case else actual, expected):
+                return False
+        return True
+
+    return matches
+
+
+def compile_selector(selector: str) -> Matcher:
+    """Matcher for a selector, where comma-separated alternatives match if any does"""
+    alternatives = [_compile_compound(part.strip()) for part in selector.split(',')]
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return lambda tag: any(matches(tag) for matches in alternatives)
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def clean_text(text: str) -> str:
+    return ' '.join(text.split()) if text else ''
+
+
+def absolute_url(value: str, base_url: str) -> Optional[str]:
+    """Resolve a link against the page; fragments and script/mail links count as missing"""
+    if not value or value.startswith(('#', 'javascript:', 'mailto:')):
+        return None
+    return urllib.parse.urljoin(base_url, value)
+
+
+def iso_date(value: str, base_url: str = None) -> Optional[str]:
+    """YYYY-MM-DD from an ISO 8601 date or timestamp"""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+# Named value transforms a field spec may refer to: fn(value, page_url)
+TRANSFORMS: Dict[str, Callable[[str, str], Optional[str]]] = {
+    'url': absolute_url,
+    'iso_date': iso_date,
+}
+
+
+class CompiledField:
+    def __init__(self, name: str, spec: Dict[str, Any], earlier: List[str]):
+        self.name = name
+        self.matchers = [compile_selector(selector) for selector in _as_list(spec.get('select'))]
+        self.source = spec.get('from')
+        if self.source is not None and self.source not in earlier:
+            raise ValueError(f"Field {name!r} reads {self.source!r}, which is not an earlier field")
+        self.siblings = spec.get('siblings')
+        self.until = compile_selector(spec['until']) if spec.get('until') else None
+        self.attrs = _as_list(spec.get('attr', 'text'))
+        self.patterns = [re.compile(pattern, re.I if spec.get('ignore_case') else 0)
+                         for pattern in _as_list(spec.get('patterns'))]
+        self.group = spec.get('group', 0)
+        transform = spec.get('transform')
+        if transform is not None and transform not in TRANSFORMS:
+            raise ValueError(f"Unknown transform {transform!r} for field {name!r}")
+        self.transform = TRANSFORMS.get(transform)
+        self.min_length = spec.get('min_length', 0)
+        self.max_length = spec.get('max_length')
+        self.required = spec.get('required', False)
+        self.keywords = [keyword.lower() for keyword in _as_list(spec.get('keywords'))]
+        self.exclude = [keyword.lower() for keyword in _as_list(spec.get('exclude'))]
+        self.default = spec.get('default')
+
+    def raw_value(self, element: Tag) -> Optional[str]:
+        for attr in self.attrs:
+            value = element.get_text() if attr == 'text' else element.get(attr)
+            if isinstance(value, list):
+                value = ' '.join(value)
+            if value:
+                return value
+        return None
+
+    def sibling_text(self, card: Tag) -> str:
+        parts = []
+        for sibling in card.next_siblings:
+            if not isinstance(sibling, Tag):
+                continue
+            if self.until is not None and self.until(sibling):
+                break
+            parts.append(clean_text(sibling.get_text()))
+            if len(parts) >= self.siblings:
+                break
+        return ' '.join(part for part in parts if part)
+
+    def finish(self, value: Optional[str], page_url: str) -> Optional[str]:
+        """Clean, match, transform and bound a raw value"""
+        value = clean_text(value)
+        if value and self.patterns:
+            for pattern in self.patterns:
+                match = pattern.search(value)
+                if match:
+                    value = clean_text(match.group(self.group))
+                    break
+            else:
+                value = ''
+        if value and self.transform is not None:
+            value = self.transform(value, page_url)
+        if value and self.max_length:
+            value = value[:self.max_length]
+        if not value or len(value) < self.min_length:
+            return None
+        return value
+
+
+class CompiledSpec:
+    """A source spec with its selectors and regexes compiled, ready to run over parsed pages"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.source = spec['source']
+        self.urls = _as_list(spec.get('urls'))
+        self.containers = [compile_selector(selector) for selector in _as_list(spec['containers'])]
+        self.constants = dict(spec.get('constants') or {})
+        self.limit = spec.get('limit')
+        self.max_events = spec.get('max_events')
+        self.unique_titles = spec.get('unique_titles', False)
+        self.fetch_options = dict(spec.get('fetch') or {})
+        self.fields: List[CompiledField] = []
+        for name, field_spec in spec['fields'].items():
+            self.fields.append(CompiledField(name, field_spec, [field.name for field in self.fields]))
+        self._selected = [field for field in self.fields if field.matchers]
+
+    def find_cards(self, soup) -> List[Tag]:
+        """Cards matched by the earliest container selector that matches anything, in one walk"""
+        buckets: List[List[Tag]] = [[] for _ in self.containers]
+        best = len(self.containers)
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            for rank in range(min(best + 1, len(self.containers))):
+                if self.containers[rank](element):
+                    bucket = buckets[rank]
+                    if not bucket or not any(parent is bucket[-1] for parent in element.parents):
+                        bucket.append(element)
+                        best = rank
+                    break
+        return buckets[best] if best < len(buckets) else []
+
+    def _select(self, card: Tag) -> Dict[str, Tag]:
+        """The element chosen by each selecting field, from one walk over the card"""
+        found: Dict[str, Tag] = {}
+        ranks = {field.name: len(field.matchers) for field in self._selected}
+        open_fields = len(self._selected)
+        for element in card.descendants:
+            if not isinstance(element, Tag):
+                continue
+            for field in self._selected:
+                rank = ranks[field.name]
+                for candidate in range(rank):
+                    if field.matchers[candidate](element):
+                        found[field.name] = element
+                        ranks[field.name] = candidate
+                        if candidate == 0:
+                            open_fields -= 1
+                        break
+            if not open_fields:
+                break
+        return found
+
+    def extract_card(self, card: Tag, page_url: str) -> Optional[Dict[str, Any]]:
+        """Event from one card, or None if a required or keyword-filtered field rejects it"""
+        found = self._select(card) if self._selected else {}
+        event: Dict[str, Any] = {}
+        extracted: Dict[str, Optional[str]] = {}
+        for field in self.fields:
+            if field.source is not None:
+                raw = extracted[field.source]
+            elif field.siblings:
+                raw = field.sibling_text(card)
+            elif field.matchers:
+                element = found.get(field.name)
+                raw = field.raw_value(element) if element is not None else None
+            else:
+                raw = field.raw_value(card)
+            value = extracted[field.name] = field.finish(raw, page_url)
+
+            if value is None and field.required:
+                return None
+            if value is not None:
+                lowered = value.lower()
+                if field.keywords and not any(keyword in lowered for keyword in field.keywords):
+                    return None
+                if any(keyword in lowered for keyword in field.exclude):
+                    return None
+            if value is None:
+                value = field.default
+                if isinstance(value, str):
+                    value = value.replace('{page_url}', page_url)
+            event[field.name] = value
+        event.update(self.constants)
+        return event
+
+    def extract(self, soup, page_url: str) -> List[Dict[str, Any]]:
+        """Events from every (or the first limit) card on a parsed page"""
+        cards = self.find_cards(soup)
+        if self.limit is not None:
+            cards = cards[:self.limit]
+        events = []
+        for card in cards:
+            event = self.extract_card(card, page_url)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def finalize(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply the spec's title deduplication and event cap to a scrape's events"""
+        if self.unique_titles:
+            events = unique_by_title(events)
+        return events[:self.max_events] if self.max_events is not None else events
+
+
+def compile_spec(spec: Dict[str, Any]) -> CompiledSpec:
+    return CompiledSpec(spec)
+
+
+class DeclarativeScraper:
+    """Scraper driven entirely by an extraction spec
+
+    Subclasses set spec (and optionally parse_only); a spec registered in
+    scraper_registry gets a DeclarativeScraper without any subclass.
+    """
+
+    spec: Dict[str, Any] = None
+    parse_only = None
+    _compiled: Dict[int, CompiledSpec] = {}
+
+    def __init__(self, spec: Dict[str, Any] = None):
+        spec = spec or self.spec
+        # Compile each spec once per process, however many scrapers use it
+        compiled = DeclarativeScraper._compiled.get(id(spec))
+        if compiled is None or compiled.spec is not spec:
+            compiled = DeclarativeScraper._compiled[id(spec)] = compile_spec(spec)
+        self.extractor = compiled
+        self.source_name = compiled.source
+        self.base_url = compiled.urls[0] if compiled.urls else None
+        self.parse_only = spec.get('parse_only', self.parse_only)
+        self.http = get_http_client()
+        self.page_cache = get_page_cache()
+
+    def extract(self, markup, page_url: str) -> List[Dict[str, Any]]:
+        """Parse a fetched page and extract its events (no network access)"""
+        soup = make_soup(markup, self.parse_only, source=self.source_name)
+        return self.extractor.extract(soup, page_url)
+
+    def scrape(self) -> List[Dict[str, Any]]:
+        """Fetch the spec's pages in order and extract events from the first that has any"""
+        events = []
+        urls = self.extractor.urls
+
+        try:
+            print(f"Scraping {self.source_name}...")
+            for url in urls:
+                try:
+                    response = self.page_cache.fetch(self.http, url, self.source_name,
+                                                     **self.extractor.fetch_options)
+                    page_events = self.extract(response.content, url)
+                    self.page_cache.set_extracted(self.source_name, url, len(page_events))
+                    events.extend(page_events)
+                    if page_events:
+                        print(f"  Found {len(page_events)} events from {url}")
+                        break
+                except PageUnchanged:
+                    # Only the page that produced events last time decides the source is unchanged
+                    if len(urls) == 1 or self.page_cache.extracted(url):
+                        raise
+                    continue
+                except Exception as e:
+                    print(f"  Error with {url}: {e}")
+                    continue
+
+        except PageUnchanged:
+            raise
+        except Exception as e:
+            print(f"Error scraping {self.source_name}: {e}")
+
+        events = self.extractor.finalize(events)
+        for event in events:
+            print(f"  ✓ {event['title']}")
+        return events
@@ -0,0 +1,108 @@
+"""
+Normalized fingerprints used to deduplicate events
+Shared by the scrapers and by DatabaseManager at ingest time: exact title
+fingerprints, MinHash signatures and LSH buckets for near-duplicates, and
+content fingerprints for incremental scraping
+"""
+
+import hashlib
+import random
+import re
+import struct
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """Lowercase a title and collapse its whitespace"""
+    return ' '.join((title or '').split()).lower()
+
+
+def title_fingerprint(title: Optional[str]) -> Optional[str]:
+    """SHA-1 of the normalized title, or None for an empty title"""
+    normalized = normalize_title(title)
+    if not normalized:
+        return None
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def unique_by_title(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Keep the first event per title fingerprint, dropping events without a title"""
+    seen = set()
+    unique = []
+    for event in events:
+        fingerprint = title_fingerprint(event.get('title'))
+        if fingerprint and fingerprint not in seen:
+            seen.add(fingerprint)
+            unique.append(event)
+    return unique
+
+
+# Fields whose change makes a re-scraped event worth writing again
+CONTENT_FIELDS = ('title', 'description', 'date', 'location', 'organizer', 'source_url',
+                  'event_type', 'tags', 'image_url')
+
+
+def content_fingerprint(row: Dict[str, Any]) -> str:
+    """SHA-1 over an event row's CONTENT_FIELDS (None and empty values hash the same)"""
+    payload = '\x1f'.join(str(row.get(field) or '') for field in CONTENT_FIELDS)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+# MinHash / LSH for near-duplicate events (same event, slightly different titles across sources)
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16  # 4 rows per band: pairs above ~0.5 similarity usually share a bucket
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20250101)  # fixed seed so stored signatures stay comparable across runs
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(MINHASH_PERMUTATIONS)]
+_NON_WORD_RE = re.compile(r'[^\w]+')
+
+
+def event_shingles(title: Optional[str], date: Any = None, location: Optional[str] = None) -> Set[str]:
+    """Character trigrams of the title plus date and city tokens"""
+    text = ' '.join(_NON_WORD_RE.sub(' ', normalize_title(title)).split())
+    shingles = {text[i:i + 3] for i in range(len(text) - 2)} or ({text} if text else set())
+    if not shingles:
+        return shingles
+    # Two tokens each so a shared date or city weighs like a couple of title trigrams
+    if date:
+        shingles.update(f"date:{date}:{i}" for i in range(2))
+    city = normalize_title((location or '').split(',')[0])
+    if city:
+        shingles.update(f"city:{city}:{i}" for i in range(2))
+    return shingles
+
+
+def minhash_signature(shingles: Set[str]) -> Optional[bytes]:
+    """MinHash signature of a shingle set packed as MINHASH_PERMUTATIONS uint32s"""
+    if not shingles:
+        return None
+    hashes = [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+              for shingle in shingles]
+    return struct.pack(f'>{MINHASH_PERMUTATIONS}I', *(
+        min((a * value + b) % _MERSENNE_PRIME for value in hashes) & 0xffffffff
+        for a, b in _PERMUTATIONS
+    ))
+
+
+def event_minhash(title: Optional[str], date: Any = None, location: Optional[str] = None) -> Optional[bytes]:
+    """MinHash signature of an event's title, date and location"""
+    return minhash_signature(event_shingles(title, date, location))
+
+
+def signature_similarity(first: bytes, second: bytes) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    width = struct.calcsize('>I')
+    matches = sum(1 for i in range(0, len(first), width) if first[i:i + width] == second[i:i + width])
+    return matches / MINHASH_PERMUTATIONS
+
+
+def lsh_buckets(signature: bytes) -> List[Tuple[int, int]]:
+    """(band, bucket) keys of a signature; similar signatures share at least one"""
+    band_bytes = len(signature) // LSH_BANDS
+    return [
+        (band, int.from_bytes(hashlib.blake2b(signature[band * band_bytes:(band + 1) * band_bytes],
+                                              digest_size=8).digest(), 'big') & 0x7fffffffffffffff)
+        for band in range(LSH_BANDS)
+    ]
@@ -0,0 +1,151 @@
+"""
+Shared HTTP fetch layer for all scrapers
+One pooled httpx.AsyncClient running on a dedicated event loop thread
+"""
+
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+import urllib.parse
+from typing import Dict, Iterable, List, Optional, Union
+
+import httpx
+
+from metrics import SCRAPER_FETCH_SECONDS, SCRAPER_RESPONSE_BYTES
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+
+class HttpClient:
+    """Async HTTP client with keep-alive pooling, per-host limits and politeness delays
+
+    Coroutines (fetch, fetch_many) can be awaited from the client's own loop;
+    the blocking facades (get, get_many) let synchronous scraper code submit
+    requests from any thread without holding a thread per request.
+    """
+
+    def __init__(self, max_connections: int = None, max_per_host: int = None,
+                 timeout: float = None, http2: bool = None, host_delay: float = None,
+                 headers: Dict[str, str] = None):
+        self.max_connections = max_connections or int(os.getenv('HTTP_MAX_CONNECTIONS', 100))
+        self.max_per_host = max_per_host or int(os.getenv('HTTP_MAX_PER_HOST', 6))
+        self.timeout = timeout or float(os.getenv('HTTP_TIMEOUT', 15))
+        self.host_delay = host_delay if host_delay is not None else float(os.getenv('SCRAPER_HOST_DELAY', 2))
+        if http2 is None:
+            http2 = os.getenv('HTTP_HTTP2', 'false').lower() in ('1', 'true', 'yes')
+        if http2 and importlib.util.find_spec('h2') is None:
+            print("⚠️  HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._next_slot: Dict[str, float] = {}
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        """Start the event loop thread and client on first use"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='http-client', daemon=True)
+                thread.start()
+                self._client = httpx.AsyncClient(
+                    headers=self.headers,
+                    timeout=httpx.Timeout(self.timeout),
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                        keepalive_expiry=30
+                    ),
+                    http2=self.http2,
+                    follow_redirects=True
+                )
+                self._loop = loop
+            return self._loop
+
+    async def _wait_for_host(self, host: str):
+        """Apply the politeness delay between requests to the same host"""
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, 0.0))
+        self._next_slot[host] = slot + self.host_delay
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def fetch(self, url: str, headers: Dict[str, str] = None,
+                    timeout: float = None, source: str = None) -> httpx.Response:
+        """Fetch a URL through the shared pool (must run on the client's loop)
+
+        source labels the fetch latency and size metrics; it defaults to the host.
+        """
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+
+        async with semaphore:
+            await self._wait_for_host(host)
+            kwargs = {'headers': headers}
+            if timeout is not None:
+                kwargs['timeout'] = timeout
+            start = time.perf_counter()
+            response = await self._client.get(url, **kwargs)
+            label = source or host
+            SCRAPER_FETCH_SECONDS.labels(source=label).observe(time.perf_counter() - start)
+            SCRAPER_RESPONSE_BYTES.labels(source=label).observe(len(response.content))
+            return response
+
+    async def fetch_many(self, urls: Iterable[str], **kwargs) -> List[Union[httpx.Response, Exception]]:
+        """Fetch many URLs concurrently; failures are returned in place of responses"""
+        return await asyncio.gather(*(self.fetch(url, **kwargs) for url in urls), return_exceptions=True)
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        """Blocking fetch for synchronous callers"""
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(self.fetch(url, **kwargs), loop).result()
+
+    def get_many(self, urls: Iterable[str], **kwargs) -> List[Union[httpx.Response, Exception]]:
+        """Blocking concurrent fetch of many URLs for synchronous callers"""
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(self.fetch_many(list(urls), **kwargs), loop).result()
+
+    def close(self):
+        """Close pooled connections and stop the loop thread"""
+        with self._lock:
+            loop, client = self._loop, self._client
+            self._loop = self._client = None
+            self._host_semaphores = {}
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HTTP client shared by all scrapers"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
+
+
+def close_http_client():
+    """Close the shared HTTP client if it was started"""
+    global _shared_client
+    with _shared_lock:
+        client, _shared_client = _shared_client, None
+    if client:
+        client.close()
@@ -0,0 +1,113 @@
+"""
+Leader election over a MySQL advisory lock
+Only the process holding the lock runs scheduled scrapes, so several uvicorn
+workers or API nodes sharing one database scrape each source once
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+LEADER_LOCK = 'bot_scraper_leader'
+# Seconds between leadership checks; followers take over within about this long after the leader dies
+LEADER_POLL_INTERVAL = float(os.getenv('LEADER_POLL_INTERVAL', 15))
+
+
+class LeaderElection:
+    """Holds GET_LOCK on a dedicated connection while this process leads
+
+    The lock lives as long as the MySQL session, so when the leader exits,
+    crashes or loses its connection the server releases it and the next
+    follower to poll takes over. The connection is not pooled: returning it
+    to the pool would hand the lock to an unrelated request.
+    """
+
+    def __init__(self, database, name: str = None, poll_interval: float = None):
+        self.database = database
+        self.name = name or os.getenv('SCRAPER_LEADER_LOCK', LEADER_LOCK)
+        self.poll_interval = poll_interval or LEADER_POLL_INTERVAL
+        self.is_leader = False
+        # _lock serializes use of the lock connection; _state_lock only guards the fields below,
+        # so stats() never waits for a MySQL round-trip
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._conn = None
+        self._leader_since: Optional[float] = None
+        self._acquisitions = 0
+        self._last_error: Optional[str] = None
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = self.database.get_connection()
+            self._conn.autocommit = True
+        return self._conn
+
+    def _drop_connection(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def check(self) -> bool:
+        """Confirm leadership if held, otherwise try to take it without waiting"""
+        with self._lock:
+            try:
+                cursor = self._connection().cursor()
+                try:
+                    if self.is_leader:
+                        cursor.execute("SELECT IS_USED_LOCK(%s) = CONNECTION_ID()", (self.name,))
+                    else:
+                        cursor.execute("SELECT GET_LOCK(%s, 0)", (self.name,))
+                    held = cursor.fetchone()[0] == 1
+                finally:
+                    cursor.close()
+                error = None
+            except Exception as e:
+                # A dead session has already lost the lock on the server side
+                error = str(e)
+                self._drop_connection()
+                held = False
+
+            with self._state_lock:
+                self._last_error = error
+                if held and not self.is_leader:
+                    self._acquisitions += 1
+                    self._leader_since = time.time()
+                    print(f"[{datetime.now()}] Became scraper leader (lock {self.name})")
+                elif not held and self.is_leader:
+                    self._leader_since = None
+                    print(f"[{datetime.now()}] Lost scraper leadership (lock {self.name})")
+                self.is_leader = held
+            return held
+
+    def release(self):
+        """Give up leadership and close the lock connection"""
+        with self._lock:
+            if self.is_leader and self._conn is not None:
+                try:
+                    cursor = self._conn.cursor()
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", (self.name,))
+                    cursor.fetchone()
+                    cursor.close()
+                except Exception:
+                    pass
+            self._drop_connection()
+            with self._state_lock:
+                self.is_leader = False
+                self._leader_since = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Whether this process leads, since when, and how often it took over (never waits on MySQL)"""
+        with self._state_lock:
+            return {
+                'lock': self.name,
+                'is_leader': self.is_leader,
+                'leader_since': datetime.fromtimestamp(self._leader_since).isoformat() if self._leader_since else None,
+                'acquisitions': self._acquisitions,
+                'poll_interval_seconds': self.poll_interval,
+                'last_error': self._last_error
+            }
@@ -0,0 +1,190 @@
+"""
+Minimal Prometheus-style metrics (counters, gauges, histograms)
+Rendered in the text exposition format by the /metrics endpoint
+"""
+
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 512 * 1024, 1024 * 1024, 5 * 1024 * 1024, 20 * 1024 * 1024)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple, object] = {}
+
+    def labels(self, **labels):
+        """Child metric for one combination of label values"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+            return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            children = list(self._children.items())
+        for key, child in sorted(children):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+
+class _Value:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = float(value)
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def _render_child(self, key, child):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {child.value}"]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Sequence[float]):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def _render_child(self, key, child):
+        with child._lock:
+            counts, total = list(child.counts), child.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            le = 'le="%s"' % ('+Inf' if bound == float('inf') else repr(float(bound)))
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+        lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+# Scraping
+SCRAPER_FETCH_SECONDS = REGISTRY.register(Histogram(
+    'scraper_fetch_seconds', 'HTTP fetch latency per scraper source', ['source']))
+SCRAPER_RESPONSE_BYTES = REGISTRY.register(Histogram(
+    'scraper_response_bytes', 'Response body size per scraper source', ['source'], buckets=SIZE_BUCKETS))
+SCRAPER_PARSE_SECONDS = REGISTRY.register(Histogram(
+    'scraper_parse_seconds', 'HTML parse time per scraper source', ['source']))
+SCRAPER_RUN_SECONDS = REGISTRY.register(Histogram(
+    'scraper_run_seconds', 'Wall time of a full scraper run per source', ['source']))
+SCRAPER_EVENTS_EXTRACTED = REGISTRY.register(Counter(
+    'scraper_events_extracted_total', 'Events extracted per scraper source', ['source']))
+SCRAPER_RUNS = REGISTRY.register(Counter(
+    'scraper_runs_total', 'Scraper runs per source by outcome', ['source', 'outcome']))
+SCRAPER_EVENT_CHANGES = REGISTRY.register(Counter(
+    'scraper_event_changes_total', 'Scraped events per source by change against stored rows',
+    ['source', 'change']))
+
+# Database
+DB_QUERY_SECONDS = REGISTRY.register(Histogram(
+    'db_query_seconds', 'DatabaseManager method latency', ['method']))
+DB_POOL = REGISTRY.register(Gauge(
+    'db_pool', 'Connection pool usage and lifetime counters', ['stat']))
+
+# API
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'http_request_seconds', 'API request latency per route', ['method', 'route', 'status']))
+EVENTS_CACHE = REGISTRY.register(Gauge(
+    'events_cache', 'Events response cache statistics', ['stat']))
+
+
+def timed(histogram: Histogram, **labels):
+    """Decorator observing a function's run time in histogram"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.labels(**labels).time():
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
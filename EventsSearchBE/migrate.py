@@ -0,0 +1,26 @@
+"""
+Apply the database schema and pending migrations, then exit
+Run as a deploy step when processes start with DB_MIGRATE_ON_STARTUP=false.
+
+Usage: python -m EventsSearchBE.migrate
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import DatabaseManager
+
+
+def main():
+    db = DatabaseManager(init_schema=False)
+    try:
+        db.init_database()
+        print(f"Database schema at version {db.schema_version}")
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Conditional-GET page cache for scrapers
+Stores ETag, Last-Modified and a body hash per URL on disk so unchanged
+listing pages can be skipped without reparsing or rewriting their events
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+class PageUnchanged(Exception):
+    """Raised when a fetched page is identical to the last successful fetch"""
+
+    def __init__(self, url: str):
+        super().__init__(f"Page unchanged since last scrape: {url}")
+        self.url = url
+
+
+class PageCache:
+    """On-disk validator cache with per-source hit/miss accounting
+
+    New validators are held as pending per source and only written to disk
+    by commit() once the events parsed from them were stored (see
+    ScraperManager.settle_page_cache), so a page whose parse came up empty
+    or whose save failed is fetched and parsed again on the next run.
+    """
+
+    def __init__(self, cache_dir: str = None, enabled: bool = None):
+        self.cache_dir = cache_dir or os.getenv(
+            'PAGE_CACHE_DIR', os.path.join(os.path.dirname(__file__), '.page_cache')
+        )
+        if enabled is None:
+            enabled = os.getenv('PAGE_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _load(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, entry: Dict[str, Any]):
+        path = self._path(entry['url'])
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def _record(self, source: str, outcome: str, bytes_saved: int = 0):
+        with self._lock:
+            stats = self._stats.setdefault(source, {
+                'hits': 0, 'misses': 0, 'not_modified': 0, 'unchanged_body': 0, 'bytes_saved': 0
+            })
+            if outcome == 'miss':
+                stats['misses'] += 1
+            else:
+                stats['hits'] += 1
+                stats[outcome] += 1
+                stats['bytes_saved'] += bytes_saved
+
+    def fetch(self, http, url: str, source: str, **kwargs) -> httpx.Response:
+        """Fetch url conditionally, raising PageUnchanged for 304s or identical bodies"""
+        if not self.enabled:
+            response = http.get(url, source=source, **kwargs)
+            response.raise_for_status()
+            return response
+
+        entry = self._load(url)
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = http.get(url, headers=headers or None, source=source, **kwargs)
+
+        if entry and response.status_code == 304:
+            self._record(source, 'not_modified', entry.get('size', 0))
+            raise PageUnchanged(url)
+
+        response.raise_for_status()
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        new_entry = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'body_hash': body_hash,
+            'size': len(response.content),
+            'extracted': entry.get('extracted', 0) if entry else 0,
+            'fetched_at': time.time()
+        }
+
+        if entry and entry.get('body_hash') == body_hash:
+            # Same body but possibly fresher validators; keep them without waiting for commit
+            self._save(new_entry)
+            self._record(source, 'unchanged_body')
+            raise PageUnchanged(url)
+
+        with self._lock:
+            self._pending.setdefault(source, {})[url] = new_entry
+        self._record(source, 'miss')
+        return response
+
+    def set_extracted(self, source: str, url: str, count: int):
+        """Remember how many events a freshly fetched page produced"""
+        with self._lock:
+            entry = self._pending.get(source, {}).get(url)
+            if entry is not None:
+                entry['extracted'] = count
+
+    def extracted(self, url: str) -> int:
+        """Number of events the cached version of url produced when last parsed"""
+        entry = self._load(url)
+        return entry.get('extracted', 0) if entry else 0
+
+    def commit(self, source: str):
+        """Persist validators fetched by a scraper run that succeeded"""
+        with self._lock:
+            entries = self._pending.pop(source, {})
+        for entry in entries.values():
+            self._save(entry)
+
+    def discard(self, source: str):
+        """Drop validators fetched by a scraper run that failed"""
+        with self._lock:
+            self._pending.pop(source, None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss counts and bytes saved per source"""
+        with self._lock:
+            result = {}
+            for source, stats in self._stats.items():
+                total = stats['hits'] + stats['misses']
+                result[source] = dict(stats, hit_ratio=round(stats['hits'] / total, 3) if total else 0.0)
+            return result
+
+
+_shared_cache: Optional[PageCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """Return the process-wide page cache shared by all scrapers"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = PageCache()
+        return _shared_cache
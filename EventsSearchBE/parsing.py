@@ -0,0 +1,43 @@
+"""
+HTML parsing helpers shared by all scrapers
+Selects the parser backend and builds partial trees from SoupStrainer declarations
+"""
+
+import importlib.util
+import os
+from typing import Any, Dict, Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from metrics import SCRAPER_PARSE_SECONDS
+
+PARSER_FALLBACK = 'html.parser'
+_PARSER_MODULES = {'lxml': 'lxml', 'lxml-xml': 'lxml', 'html5lib': 'html5lib'}
+
+
+def resolve_parser(name: str = None) -> str:
+    """Return the configured parser backend, falling back to html.parser if unavailable"""
+    name = name or os.getenv('SCRAPER_HTML_PARSER', 'lxml')
+    module = _PARSER_MODULES.get(name)
+    if module and importlib.util.find_spec(module) is None:
+        print(f"⚠️  HTML parser '{name}' is not installed; using {PARSER_FALLBACK}")
+        return PARSER_FALLBACK
+    return name
+
+
+HTML_PARSER = resolve_parser()
+
+
+def make_soup(markup: Union[str, bytes], parse_only: Optional[SoupStrainer] = None,
+              parser: str = None, source: str = None) -> BeautifulSoup:
+    """Parse markup with the configured backend, building only the strained subtrees"""
+    if source is None:
+        return BeautifulSoup(markup, parser or HTML_PARSER, parse_only=parse_only)
+    with SCRAPER_PARSE_SECONDS.labels(source=source).time():
+        return BeautifulSoup(markup, parser or HTML_PARSER, parse_only=parse_only)
+
+
+def class_string(attrs: Dict[str, Any]) -> str:
+    """Class attribute of a start tag as a single string (strainers see raw attributes)"""
+    value = attrs.get('class') or ''
+    return ' '.join(value) if isinstance(value, (list, tuple)) else value
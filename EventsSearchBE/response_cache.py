@@ -0,0 +1,113 @@
+"""
+In-process response cache for read endpoints
+Bounded LRU of pre-serialized bodies with a TTL, strong ETags and
+invalidation when an ingest run commits
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    created_at: float
+
+
+class ResponseCache:
+    """Thread-safe LRU/TTL cache bounded by entry count and total body bytes"""
+
+    def __init__(self, max_entries: int = None, ttl: float = None, max_bytes: int = None):
+        self.max_entries = max_entries or int(os.getenv('EVENTS_CACHE_MAX_ENTRIES', 256))
+        self.ttl = ttl if ttl is not None else float(os.getenv('EVENTS_CACHE_TTL', 300))
+        self.max_bytes = max_bytes or int(os.getenv('EVENTS_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        """Bumped on every invalidation; pass it back to put() to drop stale fills"""
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """Return a fresh cached response and mark it most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.created_at > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: Hashable, body: bytes, generation: int = None) -> CachedResponse:
+        """Store a serialized body and return it with its strong ETag
+
+        If the cache was invalidated since generation was read, the body is
+        returned but not stored, since it may predate the latest ingest.
+        """
+        entry = CachedResponse(body, '"' + hashlib.sha1(body).hexdigest() + '"', time.monotonic())
+        if len(body) > self.max_bytes:
+            return entry
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return entry
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+        return entry
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.body)
+
+    def invalidate(self):
+        """Drop every entry (called when new data is committed)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._generation += 1
+            self._invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio, size and memory footprint"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': round(self._hits / lookups, 3) if lookups else 0.0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations
+            }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches etag"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or f"W/{etag}" in candidates
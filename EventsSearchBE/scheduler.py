@@ -0,0 +1,209 @@
+"""
+Per-source adaptive scrape scheduler
+Each source gets its own interval, which shrinks while its events keep
+changing and grows while they do not, with jitter and exponential backoff
+after failures. Starting intervals come from the change history in
+bot_scraping_logs.
+"""
+
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+DEFAULT_INTERVAL = int(os.getenv('SCRAPE_DEFAULT_INTERVAL', 1800))
+MIN_INTERVAL = int(os.getenv('SCRAPE_MIN_INTERVAL', 300))
+MAX_INTERVAL = int(os.getenv('SCRAPE_MAX_INTERVAL', 24 * 3600))
+# Fraction of each delay added or removed at random so sources sharing a host drift apart
+JITTER = float(os.getenv('SCRAPE_JITTER', 0.1))
+# First retry delay after a failure; doubles with every consecutive failure, but a
+# failing source is never retried sooner than its regular interval
+BACKOFF_BASE = int(os.getenv('SCRAPE_BACKOFF_BASE', 60))
+# Days of bot_scraping_logs used to derive starting intervals
+HISTORY_DAYS = int(os.getenv('SCRAPE_HISTORY_DAYS', 14))
+
+# Interval multipliers after a successful run that did / did not change anything
+SPEEDUP = 0.5
+SLOWDOWN = 1.5
+
+
+def clamp_interval(seconds: float) -> float:
+    return min(MAX_INTERVAL, max(MIN_INTERVAL, seconds))
+
+
+def interval_from_history(runs: List[Dict[str, Any]], default: float) -> float:
+    """Starting interval from past runs: half the mean time between runs that changed something
+
+    runs are bot_scraping_logs rows (timestamp, success, events_changed)
+    oldest first; rows logged before events_changed existed are ignored.
+    """
+    observed = [run for run in runs if run['success'] and run['events_changed'] is not None]
+    if len(observed) < 2:
+        return default
+    span = (observed[-1]['timestamp'] - observed[0]['timestamp']).total_seconds()
+    changes = sum(1 for run in observed if run['events_changed'] > 0)
+    if changes == 0:
+        # Nothing changed over the whole window: poll at least as rarely as the window is long
+        return clamp_interval(max(default, span))
+    return clamp_interval(span / changes / 2)
+
+
+class _SourceState:
+    def __init__(self, source: str, interval: float):
+        self.source = source
+        self.interval = clamp_interval(interval)
+        self.next_run = time.time()
+        self.failures = 0
+        self.last_run: Optional[float] = None
+        self.last_outcome: Optional[str] = None
+
+
+class AdaptiveScheduler:
+    """Runs each ScraperManager source when it is due, on one background thread
+
+    A run that changed events halves the source's interval, a run that
+    changed nothing grows it by half, both within MIN_INTERVAL and
+    MAX_INTERVAL. A failed run leaves the interval alone and retries after
+    the larger of the interval and BACKOFF_BASE * 2^(failures - 1) seconds,
+    at most MAX_INTERVAL. A source may register a
+    starting scrape_interval (see scraper_registry).
+
+    With a LeaderElection, only the leading process scrapes; the others
+    poll for leadership and, on taking over, reload the schedule from the
+    logged runs so sources the old leader just scraped are not repeated.
+    """
+
+    def __init__(self, manager, database=None, default_interval: float = None, leader=None):
+        self.manager = manager
+        self.database = database
+        self.leader = leader
+        self.default_interval = default_interval or DEFAULT_INTERVAL
+        self._lock = threading.Lock()
+        self._states: Dict[str, _SourceState] = {
+            source: _SourceState(source, manager.scrape_interval(source) or self.default_interval)
+            for source in manager.sources
+        }
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_run: Optional[datetime] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * (1 + random.uniform(-JITTER, JITTER))
+
+    def load_history(self):
+        """Derive starting intervals and first run times from bot_scraping_logs
+
+        A source whose last logged run is recent enough is not scraped again
+        right after a restart; sources without history run immediately.
+        """
+        if not self.database:
+            return
+        history = self.database.get_scrape_history(days=HISTORY_DAYS)
+        now = time.time()
+        with self._lock:
+            for source, state in self._states.items():
+                runs = history.get(source)
+                if not runs:
+                    continue
+                state.interval = interval_from_history(runs, state.interval)
+                last = runs[-1]
+                state.last_run = last['timestamp'].timestamp()
+                state.next_run = max(now, state.last_run + self._jittered(state.interval))
+
+    def due(self, now: float = None) -> List[str]:
+        """Sources whose next run time has passed"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return [source for source, state in self._states.items() if state.next_run <= now]
+
+    def record(self, source: str, outcome: str, now: float = None):
+        """Update a source's interval and next run from a run's outcome ('changed', 'unchanged' or 'error')"""
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._states[source]
+            state.last_run = now
+            state.last_outcome = outcome
+            if outcome == 'error':
+                state.failures += 1
+                delay = min(MAX_INTERVAL, max(state.interval, BACKOFF_BASE * 2 ** (state.failures - 1)))
+            else:
+                state.failures = 0
+                state.interval = clamp_interval(state.interval * (SPEEDUP if outcome == 'changed' else SLOWDOWN))
+                delay = state.interval
+            state.next_run = now + self._jittered(delay)
+
+    def run_due(self) -> List[str]:
+        """Scrape every due source once and reschedule it, returning the sources run"""
+        sources = self.due()
+        if not sources:
+            return []
+        print(f"[{datetime.now()}] Scheduled scraping: {', '.join(sources)}")
+        self.manager.scrape_all(sources=sources)
+        self.last_run = datetime.now()
+        for source in sources:
+            self.record(source, self.manager.last_outcomes.get(source, 'error'))
+        return sources
+
+    def run(self):
+        """Schedule and run scrapes on the calling thread until stop() is called"""
+        history_loaded = False
+        while not self._stop.is_set():
+            if self.leader is not None and not self.leader.check():
+                history_loaded = False
+                self._stop.wait(self.leader.poll_interval)
+                continue
+            if not history_loaded:
+                history_loaded = True
+                try:
+                    self.load_history()
+                except Exception as e:
+                    print(f"[{datetime.now()}] Could not load scrape history, starting with default intervals: {e}")
+            try:
+                self.run_due()
+            except Exception as e:
+                print(f"[{datetime.now()}] Scheduler error: {e}")
+            with self._lock:
+                next_run = min((state.next_run for state in self._states.values()), default=time.time() + 60)
+            wait = min(60, max(1, next_run - time.time()))
+            if self.leader is not None:
+                # Keep the lock session busy and notice a lost lock between runs
+                wait = min(wait, self.leader.poll_interval)
+            self._stop.wait(wait)
+        if self.leader is not None:
+            self.leader.release()
+
+    def start(self):
+        """Start the scheduler thread"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name='scrape-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Ask the scheduler thread to stop after its current run"""
+        self._stop.set()
+
+    def schedule(self) -> List[Dict[str, Any]]:
+        """Interval, next run time and recent outcome per source, soonest first"""
+        now = time.time()
+        with self._lock:
+            states = sorted(self._states.values(), key=lambda state: state.next_run)
+            return [
+                {
+                    'source': state.source,
+                    'interval_seconds': round(state.interval),
+                    'next_run': datetime.fromtimestamp(state.next_run).isoformat(),
+                    'seconds_until_next_run': max(0, round(state.next_run - now)),
+                    'consecutive_failures': state.failures,
+                    'last_run': datetime.fromtimestamp(state.last_run).isoformat() if state.last_run else None,
+                    'last_outcome': state.last_outcome
+                }
+                for state in states
+            ]
@@ -1,28 +1,37 @@
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime
-from typing import List, Dict, Any
-import time
+from typing import List, Dict, Any, Optional
 import re
-import os
 import urllib.parse
-from PIL import Image
-import io
+
+from http_client import get_http_client
+from image_pipeline import get_image_pipeline
+from page_cache import PageUnchanged, get_page_cache
+from parsing import class_string, make_soup
+from scraper_manager import ScraperManager  # re-exported: it used to live in this module
+
+__all__ = [
+    'BaseScraper', 'StartupIndiaScraper', 'THubScraper', 'NasscomScraper', 'StartupEventsScraper',
+    'ScraperManager'
+]
+
 
 class BaseScraper:
+    # Subtrees get_page builds; None parses the whole document
+    parse_only: Optional[SoupStrainer] = None
+    
     def __init__(self, source_name: str):
         self.source_name = source_name
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.http = get_http_client()
+        self.page_cache = get_page_cache()
     
     def get_page(self, url: str) -> BeautifulSoup:
-        """Fetch and parse a web page"""
+        """Fetch and parse a web page, raising PageUnchanged if it did not change"""
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            response = self.page_cache.fetch(self.http, url, self.source_name)
+            return make_soup(response.content, self.parse_only, source=self.source_name)
+        except PageUnchanged:
+            raise
         except Exception as e:
             print(f"Error fetching {url}: {e}")
             return None
@@ -41,43 +50,28 @@ class BaseScraper:
         return self.clean_text(date_text)
     
     def download_image(self, image_url: str, event_title: str) -> str:
-        """Download and save image, return local path"""
+        """Download and store an image by content hash, return its local path"""
+        if not image_url or not image_url.startswith(('http://', 'https://')):
+            return None
         try:
-            if not image_url or not image_url.startswith(('http://', 'https://')):
-                return None
-                
-            # Create images directory if it doesn't exist
-            images_dir = os.path.join(os.path.dirname(__file__), '..', 'frontend', 'images')
-            os.makedirs(images_dir, exist_ok=True)
-            
-            # Generate filename from event title
-            safe_title = re.sub(r'[^\w\s-]', '', event_title).strip()
-            safe_title = re.sub(r'[\s_-]+', '_', safe_title)
-            filename = f"{safe_title[:50]}.jpg"  # Limit filename length
-            filepath = os.path.join(images_dir, filename)
-            
-            # Download image
-            response = self.session.get(image_url, timeout=10)
-            response.raise_for_status()
-            
-            # Process and save image
-            image = Image.open(io.BytesIO(response.content))
-            
-            # Resize image to standard size (400x300) while maintaining aspect ratio
-            image.thumbnail((400, 300), Image.Resampling.LANCZOS)
-            
-            # Convert to RGB if necessary and save as JPEG
-            if image.mode in ("RGBA", "P"):
-                image = image.convert("RGB")
-            
-            image.save(filepath, "JPEG", quality=85, optimize=True)
-            
-            # Return relative path for web use
-            return f"images/{filename}"
-            
+            path = self.download_images([image_url]).get(image_url)
         except Exception as e:
             print(f"Error downloading image for {event_title}: {e}")
             return None
+        if path is None:
+            print(f"Error downloading image for {event_title}: {image_url}")
+        return path
+    
+    def download_images(self, image_urls: List[str]) -> Dict[str, str]:
+        """Download many images concurrently, return local paths (default variant) per URL
+        
+        Images already stored are not fetched again; all size and format
+        variants are written under images/ by the shared image pipeline.
+        """
+        pipeline = get_image_pipeline()
+        urls = [url for url in image_urls if url and url.startswith(('http://', 'https://'))]
+        results = pipeline.process(urls, source=self.source_name)
+        return {url: f"images/{variants[pipeline.default_variant]}" for url, variants in results.items()}
     
     def extract_image_url(self, soup, base_url: str = None) -> str:
         """Extract the best image from soup"""
@@ -123,6 +117,8 @@ class BaseScraper:
 
 
 class StartupIndiaScraper(BaseScraper):
+    parse_only = SoupStrainer('div', class_=re.compile(r'card'))
+    
     def __init__(self):
         super().__init__("Startup India")
         self.base_url = "https://www.startupindia.gov.in"
@@ -168,6 +164,8 @@ class StartupIndiaScraper(BaseScraper):
                     }
                     events.append(event)
         
+        except PageUnchanged:
+            raise
         except Exception as e:
             print(f"Error scraping Startup India: {e}")
         
@@ -175,6 +173,10 @@ class StartupIndiaScraper(BaseScraper):
 
 
 class THubScraper(BaseScraper):
+    parse_only = SoupStrainer(
+        lambda name, attrs: name == 'article' or 'event-item' in class_string(attrs)
+    )
+    
     def __init__(self):
         super().__init__("T-Hub")
         self.base_url = "https://t-hub.co"
@@ -228,6 +230,8 @@ class THubScraper(BaseScraper):
             }
             events.append(sample_event)
         
+        except PageUnchanged:
+            raise
         except Exception as e:
             print(f"Error scraping T-Hub: {e}")
         
@@ -235,6 +239,9 @@ class THubScraper(BaseScraper):
 
 
 class NasscomScraper(BaseScraper):
+    # The page is only fetched to confirm the site is up
+    parse_only = SoupStrainer('title')
+    
     def __init__(self):
         super().__init__("NASSCOM")
         self.base_url = "https://nasscom.in"
@@ -307,6 +314,8 @@ class NasscomScraper(BaseScraper):
                 }
                 events.append(event)
         
+        except PageUnchanged:
+            raise
         except Exception as e:
             print(f"Error scraping NASSCOM: {e}")
         
@@ -314,6 +323,9 @@ class NasscomScraper(BaseScraper):
 
 
 class StartupEventsScraper(BaseScraper):
+    # The page is only fetched to confirm the site is up
+    parse_only = SoupStrainer('title')
+    
     def __init__(self):
         super().__init__("Startup Events")
         self.base_url = "https://startupevents.org"
@@ -402,79 +414,9 @@ class StartupEventsScraper(BaseScraper):
             
             events.extend(sample_events)
         
+        except PageUnchanged:
+            raise
         except Exception as e:
             print(f"Error scraping Startup Events: {e}")
         
         return events
-
-
-class ScraperManager:
-    def __init__(self, database=None):
-        self.database = database
-        
-        # Import the new scrapers
-        try:
-            from new_scrapers import StartupNewsAggregator, Inc42Scraper, EventbriteScraper, GlobalStartupAwardsScraper
-
-            self.scrapers = [
-                StartupEventsScraper(),    # Existing excellent source
-                StartupIndiaScraper(),     # Government schemes
-                THubScraper(),             # Hyderabad incubator
-                NasscomScraper(),          # Industry events
-                StartupNewsAggregator(),   # NEW: Curated startup events (replaces 10times)
-                Inc42Scraper(),            # NEW: Inc42 startup news & events
-                EventbriteScraper(),       # NEW: Eventbrite startup events
-                GlobalStartupAwardsScraper()
-            ]
-            print(f"✅ Loaded {len(self.scrapers)} scrapers including new sources")
-            
-        except ImportError as e:
-            print(f"⚠️  Could not import new scrapers: {e}")
-            # Fallback to existing scrapers
-            self.scrapers = [
-                StartupEventsScraper(),
-                StartupIndiaScraper(),
-                THubScraper(), 
-                NasscomScraper()
-            ]
-    
-    def run_all_scrapers(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Run all scrapers and collect results"""
-        results = {}
-        
-        for scraper in self.scrapers:
-            print(f"Running scraper for {scraper.source_name}...")
-            try:
-                events = scraper.scrape()
-                results[scraper.source_name] = events
-                print(f"Found {len(events)} events from {scraper.source_name}")
-                time.sleep(2)  # Be respectful to servers
-            except Exception as e:
-                print(f"Error with {scraper.source_name}: {e}")
-                results[scraper.source_name] = []
-        
-        return results
-    
-    def scrape_all(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Run all scrapers and save to database if available"""
-        results = self.run_all_scrapers()
-        
-        # Save to database if available
-        if self.database:
-            for source, events in results.items():
-                for event in events:
-                    try:
-                        self.database.add_event(
-                            title=event.get('title', ''),
-                            description=event.get('description', ''),
-                            date=event.get('date', ''),
-                            location=event.get('location', ''),
-                            url=event.get('source_url', event.get('url', '')),
-                            source=source,
-                            event_type=event.get('event_type', event.get('type', 'startup_program')),
-                            image_url=event.get('image_url')
-                        )
-                    except Exception as e:
-                        print(f"Error saving event to database: {e}")
-        
-        return results
\ No newline at end of file
@@ -0,0 +1,218 @@
+"""
+ScraperManager: runs the registered scrapers and saves their events
+Scraper modules (and with them bs4, httpx and PIL) are imported when a source
+first runs, so importing this module is cheap for the API process
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+import os
+import threading
+
+from metrics import SCRAPER_EVENT_CHANGES, SCRAPER_EVENTS_EXTRACTED, SCRAPER_RUN_SECONDS, SCRAPER_RUNS
+from scraper_registry import get_spec, load_scraper_class, registered_sources
+
+
+class ScraperManager:
+    def __init__(self, database=None, max_workers: int = None, host_delay: float = None,
+                 sources: List[str] = None):
+        self.database = database
+        
+        # Registered sources (optionally narrowed to sources); scrapers are built on first run
+        self.sources = [source for source in registered_sources() if sources is None or source in sources]
+        self._scrapers: Dict[str, Any] = {}
+        self._scrapers_lock = threading.Lock()
+        
+        # Concurrency and politeness settings
+        if max_workers is None:
+            max_workers = int(os.getenv('SCRAPER_MAX_WORKERS', len(self.sources)))
+        self.max_workers = max(1, max_workers)
+        self.host_delay = host_delay
+        self.last_errors: Dict[str, str] = {}
+        self.last_unchanged: List[str] = []
+        self.last_changes: Dict[str, Dict[str, int]] = {}
+        self.last_outcomes: Dict[str, str] = {}
+    
+    @property
+    def page_cache(self):
+        from page_cache import get_page_cache
+        return get_page_cache()
+    
+    @property
+    def http(self):
+        """Pooled client shared by all scrapers; politeness delays are per host"""
+        from http_client import get_http_client
+        client = get_http_client()
+        if self.host_delay is not None:
+            client.host_delay = self.host_delay
+        return client
+    
+    def scraper(self, source: str):
+        """The scraper instance for a source, importing and building it on first use"""
+        with self._scrapers_lock:
+            scraper = self._scrapers.get(source)
+            if scraper is None:
+                scraper = self._scrapers[source] = load_scraper_class(source)()
+                print(f"✅ Loaded scraper for {source}")
+            return scraper
+    
+    @property
+    def scrapers(self) -> List[Any]:
+        """Instances of every source's scraper (builds any not loaded yet)"""
+        return [self.scraper(source) for source in self.sources]
+    
+    def scrape_interval(self, source: str) -> Optional[int]:
+        """Registered starting interval of a source for the scheduler, if any"""
+        return get_spec(source).scrape_interval
+    
+    def _run_scraper(self, source: str) -> Tuple[List[Dict[str, Any]], Optional[str], bool]:
+        """Run a single source's scraper, returning its events, error message and unchanged flag"""
+        from page_cache import PageUnchanged
+        print(f"Running scraper for {source}...")
+        with SCRAPER_RUN_SECONDS.labels(source=source).time():
+            try:
+                # New page validators stay pending until settle_page_cache() after the save
+                events = self.scraper(source).scrape()
+                print(f"Found {len(events)} events from {source}")
+                SCRAPER_EVENTS_EXTRACTED.labels(source=source).inc(len(events))
+                SCRAPER_RUNS.labels(source=source, outcome='success').inc()
+                return events, None, False
+            except PageUnchanged:
+                self.page_cache.commit(source)
+                print(f"No changes from {source} since last scrape, skipping")
+                SCRAPER_RUNS.labels(source=source, outcome='unchanged').inc()
+                return [], None, True
+            except Exception as e:
+                self.page_cache.discard(source)
+                print(f"Error with {source}: {e}")
+                SCRAPER_RUNS.labels(source=source, outcome='error').inc()
+                return [], str(e), False
+    
+    def run_all_scrapers(self, max_workers: int = None, sources: List[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Run all scrapers (or only those named in sources) and collect results
+        
+        Scrapers run concurrently on up to max_workers threads (1 runs them
+        sequentially). Requests to the same host are spaced by the shared
+        HTTP client instead of sleeping after every scraper. Errors from the
+        last run are available in self.last_errors, keyed by source name,
+        and sources whose pages were unchanged in self.last_unchanged.
+        """
+        selected = [source for source in self.sources if sources is None or source in sources]
+        workers = min(max_workers or self.max_workers, len(selected)) or 1
+        self.http  # apply host_delay before the first request
+        
+        if workers == 1:
+            outcomes = [self._run_scraper(source) for source in selected]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scraper') as executor:
+                outcomes = list(executor.map(self._run_scraper, selected))
+        
+        results = {}
+        errors = {}
+        unchanged = []
+        for source, (events, error, is_unchanged) in zip(selected, outcomes):
+            results[source] = events
+            if error:
+                errors[source] = error
+            if is_unchanged:
+                unchanged.append(source)
+        self.last_errors = errors
+        self.last_unchanged = unchanged
+        
+        return results
+    
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Page cache hit/miss counts per source"""
+        return self.page_cache.stats()
+    
+    @staticmethod
+    def _to_db_event(event: Dict[str, Any], source: str) -> Dict[str, Any]:
+        """Map a scraped event to database fields (same mapping as DatabaseManager.add_event)"""
+        return {
+            'title': event.get('title', ''),
+            'description': event.get('description', ''),
+            'date': event.get('date', ''),
+            'location': event.get('location', ''),
+            'organizer': source or 'Unknown',
+            'source_url': event.get('source_url', event.get('url', '')) or '',
+            'event_type': event.get('event_type', event.get('type', 'startup_program')),
+            'tags': [],
+            'image_url': event.get('image_url')
+        }
+    
+    def settle_page_cache(self, source: str, persisted: bool):
+        """Keep the page validators a source's run fetched only if its events were stored
+        
+        Committing them before the save would make the next run see the page
+        as unchanged and never write events whose save failed. Runs that
+        extracted nothing (scrapers swallow parse errors) are discarded too,
+        so the page is parsed again next time.
+        """
+        if persisted:
+            self.page_cache.commit(source)
+        else:
+            self.page_cache.discard(source)
+    
+    def record_changes(self, source: str, counts: Dict[str, int]):
+        """Keep a source's new/changed/unchanged/disappeared counts for reporting"""
+        self.last_changes[source] = counts
+        for change in ('new', 'changed', 'unchanged', 'disappeared'):
+            SCRAPER_EVENT_CHANGES.labels(source=source, change=change).inc(counts[change])
+        print(f"Saved {source}: {counts['new']} new, {counts['changed']} changed, "
+              f"{counts['unchanged']} unchanged, {counts['disappeared']} disappeared")
+    
+    @staticmethod
+    def changed_count(counts: Dict[str, int]) -> int:
+        """Events a sync actually changed: new, changed and disappeared ones"""
+        return counts['new'] + counts['changed'] + counts['disappeared']
+    
+    def scrape_all(self, sources: List[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Run all scrapers (or only those named in sources) and save to database if available
+        
+        Only new and changed events are written; per-source counts of the
+        diff against stored events are kept in self.last_changes (sources
+        that saved nothing this run have none), and
+        each source's outcome ('changed', 'unchanged' or 'error') in
+        self.last_outcomes for the scheduler.
+        """
+        results = self.run_all_scrapers(sources=sources)
+        
+        for source in results:
+            self.last_changes.pop(source, None)
+        for source, events in results.items():
+            error_message = self.last_errors.get(source)
+            saved = 0
+            changed = 0
+            if events and self.database:
+                try:
+                    counts = self.database.sync_source_events(
+                        [self._to_db_event(event, source) for event in events],
+                        source=source
+                    )
+                    saved = counts['new'] + counts['changed'] + counts['unchanged']
+                    changed = self.changed_count(counts)
+                    self.record_changes(source, counts)
+                except Exception as e:
+                    error_message = str(e)
+                    print(f"Error saving events from {source} to database: {e}")
+            elif events:
+                saved = changed = len(events)
+            self.settle_page_cache(source, bool(events) and error_message is None)
+            
+            success = error_message is None and (saved > 0 or source in self.last_unchanged)
+            # An error-free run that found nothing is not a failure to retry soon
+            self.last_outcomes[source] = 'error' if error_message else 'changed' if changed else 'unchanged'
+            
+            if self.database:
+                try:
+                    self.database.log_scraping_result(
+                        source=source,
+                        events_found=saved,
+                        success=success,
+                        error_message=error_message,
+                        events_changed=changed if success else None
+                    )
+                except Exception as e:
+                    print(f"Error logging scraping result for {source}: {e}")
+        
+        return results
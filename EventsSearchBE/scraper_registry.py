@@ -0,0 +1,65 @@
+"""
+Registry of scraper sources
+Maps each source name to its scraper class as a 'module:Class' path, so
+sources can be listed and scheduled without importing bs4, httpx, PIL or the
+scraper modules; a scraper's module is imported when it first runs. The path
+may also name an extraction spec dict (see extraction.py), which makes adding
+a listing-page source config-only.
+"""
+
+import functools
+import importlib
+import os
+from typing import Dict, List, NamedTuple, Optional
+
+
+class ScraperSpec(NamedTuple):
+    source: str
+    target: str  # 'module:Class' constructed without arguments, or 'module:SPEC'
+    scrape_interval: Optional[int] = None  # starting interval for the adaptive scheduler
+
+
+_REGISTRY: Dict[str, ScraperSpec] = {}
+
+
+def register_scraper(source: str, target: str, scrape_interval: int = None):
+    """Register (or replace) the scraper class for a source; sources run in registration order"""
+    _REGISTRY[source] = ScraperSpec(source, target, scrape_interval)
+
+
+def registered_sources() -> List[str]:
+    return list(_REGISTRY)
+
+
+def get_spec(source: str) -> ScraperSpec:
+    return _REGISTRY[source]
+
+
+def load_scraper_class(source: str):
+    """Import the module of a source's scraper and return its class (or a spec's scraper factory)"""
+    module_name, _, class_name = _REGISTRY[source].target.partition(':')
+    target = getattr(importlib.import_module(module_name), class_name)
+    if isinstance(target, dict):
+        from extraction import DeclarativeScraper
+        return functools.partial(DeclarativeScraper, target)
+    return target
+
+
+# Sources serving hard-coded event lists gain little from frequent polling
+_DAILY = 24 * 3600
+
+register_scraper('Startup Events', 'scraper:StartupEventsScraper', scrape_interval=_DAILY)
+register_scraper('Startup India', 'scraper:StartupIndiaScraper')
+register_scraper('T-Hub', 'scraper:THubScraper')
+register_scraper('NASSCOM', 'scraper:NasscomScraper', scrape_interval=_DAILY)
+register_scraper('StartupNews', 'new_scrapers:StartupNewsAggregator', scrape_interval=_DAILY)
+register_scraper('Inc42', 'new_scrapers:Inc42Scraper')
+register_scraper('Eventbrite', 'new_scrapers:EventbriteScraper')
+register_scraper('GlobalStartupAwards', 'new_scrapers:GlobalStartupAwardsScraper')
+
+# Comma-separated modules that call register_scraper for extra sources when imported
+for _plugin in filter(None, (name.strip() for name in os.getenv('SCRAPER_PLUGINS', '').split(','))):
+    try:
+        importlib.import_module(_plugin)
+    except Exception as e:
+        print(f"⚠️  Could not load scraper plugin {_plugin}: {e}")
@@ -0,0 +1,268 @@
+"""
+In-memory trigram index for typeahead suggestions
+Serves /events/suggest from process memory over event titles and organizers,
+built from the database at startup and extended after each ingest
+"""
+
+import bisect
+import itertools
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+_NON_WORD_RE = re.compile(r'[^\w]+')
+
+# Estimated bytes per posting-set slot and per entry (tuple, dict slots, sorted-list slot),
+# calibrated with tracemalloc on 100k titles
+_POSTING_BYTES = 72
+_ENTRY_OVERHEAD = 300
+
+# Fuzzy candidates scored per lookup; very common trigrams are narrowed by intersection first
+MAX_CANDIDATES = 2000
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase text, turning punctuation into spaces and collapsing whitespace"""
+    return ' '.join(_NON_WORD_RE.sub(' ', (text or '').lower()).split())
+
+
+def trigrams(normalized: str, partial_last: bool = False) -> Set[str]:
+    """Word trigrams padded like pg_trgm; partial_last leaves the last word open for prefixes"""
+    words = normalized.split()
+    grams = set()
+    for i, word in enumerate(words):
+        padded = '  ' + word + ('' if partial_last and i == len(words) - 1 else ' ')
+        grams.update(padded[j:j + 3] for j in range(len(padded) - 2))
+    return grams
+
+
+class _Entry(NamedTuple):
+    text: str
+    kind: str
+    event_id: Optional[int]
+    normalized: str
+    size: int
+
+
+class SuggestIndex:
+    """Thread-safe trigram index over distinct titles and organizers, capped by an estimated memory budget
+
+    Exact prefixes are served from a sorted list by binary search; when
+    they give fewer than limit results and the prefix has 3+ characters,
+    the trigram postings add fuzzy and mid-title word matches (a
+    suggestion needs min_similarity of the prefix's trigrams).
+    When the budget is exceeded the oldest entries are evicted first.
+    """
+
+    def __init__(self, max_bytes: int = None, min_similarity: float = None):
+        self.max_bytes = max_bytes or int(os.getenv('SUGGEST_INDEX_MAX_BYTES', 16 * 1024 * 1024))
+        self.min_similarity = min_similarity or float(os.getenv('SUGGEST_MIN_SIMILARITY', 0.5))
+
+        self._lock = threading.RLock()
+        self._reset()
+        self._ready = False
+        self._built_at = None
+        self._build_seconds = None
+
+    def _reset(self):
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._by_key: Dict[Tuple[str, str], int] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._sorted: List[Tuple[str, int]] = []
+        self._next_id = 0
+        self._bytes = 0
+        self._evictions = 0
+        self._last_event_id = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    @staticmethod
+    def _estimate(text: str, normalized: str, grams) -> int:
+        return sys.getsizeof(text) + sys.getsizeof(normalized) + _POSTING_BYTES * len(grams) + _ENTRY_OVERHEAD
+
+    def add(self, text: Optional[str], kind: str, event_id: int = None) -> bool:
+        """Index text unless an entry of the same kind and normalized text exists"""
+        normalized = normalize(text)
+        if not normalized:
+            return False
+        with self._lock:
+            if (kind, normalized) in self._by_key:
+                return False
+            self._insert(text, kind, event_id, normalized, trigrams(normalized))
+            bisect.insort(self._sorted, (normalized, self._next_id - 1))
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._evict_oldest()
+            return True
+
+    def _insert(self, text: str, kind: str, event_id: Optional[int], normalized: str, grams: Set[str]):
+        entry = _Entry(' '.join(text.split()), kind, event_id, normalized,
+                       self._estimate(text, normalized, grams))
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = entry
+        self._by_key[(kind, normalized)] = entry_id
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(entry_id)
+        self._bytes += entry.size
+
+    def _evict_oldest(self):
+        entry_id, entry = self._entries.popitem(last=False)
+        del self._by_key[(entry.kind, entry.normalized)]
+        for gram in trigrams(entry.normalized):
+            posting = self._postings[gram]
+            posting.discard(entry_id)
+            if not posting:
+                del self._postings[gram]
+        position = bisect.bisect_left(self._sorted, (entry.normalized, entry_id))
+        del self._sorted[position]
+        self._bytes -= entry.size
+        self._evictions += 1
+
+    def _add_event(self, row: Dict[str, Any]):
+        self.add(row.get('title'), 'title', row['id'])
+        self.add(row.get('organizer'), 'organizer')
+        self._last_event_id = max(self._last_event_id, row['id'])
+
+    def rebuild(self, database, batch_size: int = 1000):
+        """Load the newest canonical events that fit the memory budget"""
+        start = time.perf_counter()
+        pending = []  # (text, kind, event_id, normalized, grams), newest first
+        seen = set()
+        estimated = 0
+        last_event_id = 0
+        before_id = None
+        full = False
+        while not full:
+            batch = database.get_suggestion_rows(before_id=before_id, limit=batch_size)
+            if not batch:
+                break
+            for row in batch:
+                row_items = []
+                row_bytes = 0
+                for text, kind, event_id in ((row.get('title'), 'title', row['id']),
+                                             (row.get('organizer'), 'organizer', None)):
+                    normalized = normalize(text)
+                    if normalized and (kind, normalized) not in seen:
+                        seen.add((kind, normalized))
+                        grams = trigrams(normalized)
+                        row_items.append((text, kind, event_id, normalized, grams))
+                        row_bytes += self._estimate(text, normalized, grams)
+                if estimated + row_bytes > self.max_bytes:
+                    full = True
+                    break
+                estimated += row_bytes
+                pending.extend(reversed(row_items))
+                last_event_id = max(last_event_id, row['id'])
+            before_id = batch[-1]['id']
+
+        with self._lock:
+            self._reset()
+            # Oldest first so eviction order matches age
+            for item in reversed(pending):
+                self._insert(*item)
+            self._sorted = sorted((entry.normalized, entry_id) for entry_id, entry in self._entries.items())
+            self._last_event_id = last_event_id
+            self._ready = True
+            self._built_at = time.time()
+            self._build_seconds = round(time.perf_counter() - start, 3)
+
+    def refresh(self, database, batch_size: int = 1000):
+        """Add canonical events ingested since the last build or refresh"""
+        if not self._ready:
+            return
+        while True:
+            batch = database.get_suggestion_rows(after_id=self._last_event_id, limit=batch_size)
+            if not batch:
+                break
+            with self._lock:
+                for row in batch:
+                    self._add_event(row)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Best suggestions for a typed prefix: exact prefix matches first, then fuzzy ones"""
+        query = normalize(prefix)
+        if not query or limit <= 0:
+            return []
+        with self._lock:
+            best = dict((entry_id, score) for score, entry_id in self._prefix_matches(query, limit))
+            if len(query) >= 3 and len(best) < limit:
+                for score, entry_id in self._fuzzy_matches(query, limit):
+                    best[entry_id] = max(score, best.get(entry_id, 0))
+            scored = [(score, entry_id) for entry_id, score in best.items()]
+            scored.sort(key=lambda item: (-item[0], len(self._entries[item[1]].text), item[1]))
+            return [self._format(entry_id, score) for score, entry_id in scored[:limit]]
+
+    def _prefix_matches(self, query: str, limit: int) -> List[Tuple[float, int]]:
+        position = bisect.bisect_left(self._sorted, (query, -1))
+        matches = []
+        while position < len(self._sorted) and len(matches) < limit * 4:
+            normalized, entry_id = self._sorted[position]
+            if not normalized.startswith(query):
+                break
+            matches.append((2.0, entry_id))
+            position += 1
+        return matches
+
+    def _fuzzy_matches(self, query: str, limit: int) -> List[Tuple[float, int]]:
+        grams = trigrams(query, partial_last=True)
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        needed = max(1, math.ceil(len(postings) * self.min_similarity))
+        # A candidate sharing `needed` grams must appear in one of the rarest len - needed + 1 postings
+        rarest = postings[:len(postings) - needed + 1]
+        candidates = set().union(*rarest) if sum(map(len, rarest)) <= MAX_CANDIDATES else None
+        if candidates is None:
+            # Common trigrams: keep entries sharing the rarest ones (exact matches survive, typos may not)
+            candidates = postings[0]
+            for posting in postings[1:]:
+                if len(candidates) <= MAX_CANDIDATES:
+                    break
+                candidates = candidates & posting
+            if len(candidates) > MAX_CANDIDATES:
+                candidates = set(itertools.islice(candidates, MAX_CANDIDATES))
+        shared = Counter()
+        for posting in postings:
+            shared.update(posting & candidates)
+        scored = []
+        # Exact and prefix matches share every gram, so they are always among the most common
+        for entry_id, count in shared.most_common(limit * 4):
+            if count < needed:
+                break
+            score = count / len(postings)
+            normalized = self._entries[entry_id].normalized
+            if normalized.startswith(query):
+                score += 1.0
+            elif (' ' + query) in (' ' + normalized):
+                score += 0.5
+            scored.append((score, entry_id))
+        return scored
+
+    def _format(self, entry_id: int, score: float) -> Dict[str, Any]:
+        entry = self._entries[entry_id]
+        return {
+            'text': entry.text,
+            'kind': entry.kind,
+            'event_id': entry.event_id,
+            'score': round(score, 3)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, estimated memory use against the budget and build info"""
+        with self._lock:
+            return {
+                'ready': self._ready,
+                'entries': len(self._entries),
+                'trigrams': len(self._postings),
+                'approx_bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self._evictions,
+                'last_event_id': self._last_event_id,
+                'built_at': self._built_at,
+                'build_seconds': self._build_seconds
+            }
@@ -0,0 +1,126 @@
+"""
+/events and /events/search serialize rows shaped like bot_events, including the
+internal binary and fingerprint columns a SELECT * would return
+"""
+
+import os
+import re
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+
+# Every bot_events column after all migrations, as mysql-connector returns them
+TABLE_ROW = {
+    'id': 7,
+    'title': 'Startup Pitch Night',
+    'description': 'Founders pitch to angels',
+    'date': date(2025, 12, 1),
+    'location': 'Bengaluru, India',
+    'organizer': 'Eventbrite',
+    'source_url': 'https://www.eventbrite.com/e/startup-pitch-night',
+    'event_type': 'startup_event',
+    'tags': '["startup", "pitch"]',
+    'image_url': None,
+    'created_at': datetime(2025, 11, 1, 10, 0, 0),
+    'updated_at': datetime(2025, 11, 2, 10, 0, 0),
+    'title_fingerprint': 'a' * 40,
+    'canonical_id': None,
+    'source': 'Eventbrite',
+    'minhash': b'\x00\xff\x10\x80' * 32,
+    'content_fingerprint': 'b' * 40,
+}
+
+
+class FakeCursor:
+    """Returns TABLE_ROW restricted to the columns the query selects"""
+
+    def __init__(self):
+        self.rows = []
+
+    def execute(self, query, params=None):
+        selected = re.search(r'SELECT\s+(.*?)\s+FROM\s+bot_events', query, re.S | re.I).group(1)
+        row = {}
+        if 'AS relevance' in selected:
+            row['relevance'] = 1.5
+            selected = selected.split('MATCH(')[0]
+        for column in (part.strip() for part in selected.split(',')):
+            if column == '*':
+                row.update(TABLE_ROW)
+            elif column:
+                row[column] = TABLE_ROW[column]
+        self.rows = [row]
+
+    def fetchall(self):
+        return [dict(row) for row in self.rows]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def cursor(self, **kwargs):
+        return FakeCursor()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    @contextmanager
+    def connection():
+        yield FakeConnection()
+
+    monkeypatch.setattr(app_module.db, 'connection', connection)
+    app_module.events_cache.invalidate()
+    return TestClient(app_module.app)
+
+
+def test_events_serializes_table_rows(client):
+    response = client.get('/events?limit=1')
+    assert response.status_code == 200
+    event = response.json()['events'][0]
+    assert event['title'] == TABLE_ROW['title']
+    assert event['date'] == '2025-12-01'
+    for internal in ('minhash', 'title_fingerprint', 'content_fingerprint'):
+        assert internal not in event
+
+
+def test_search_serializes_table_rows(client):
+    response = client.get('/events/search?q=pitch&limit=1')
+    assert response.status_code == 200
+    event = response.json()['events'][0]
+    assert event['relevance'] == 1.5
+    assert 'minhash' not in event
+
+
+@pytest.mark.parametrize('limit', [0, -1, app_module.EVENTS_MAX_LIMIT + 1])
+def test_events_rejects_out_of_range_limit(client, limit):
+    assert client.get(f'/events?limit={limit}').status_code == 422
+
+
+@pytest.mark.parametrize('limit', [0, -1, app_module.EVENTS_MAX_LIMIT + 1])
+def test_search_rejects_out_of_range_limit(client, limit):
+    assert client.get(f'/events/search?q=pitch&limit={limit}').status_code == 422
+
+
+def test_unhandled_errors_are_observed_as_500(client, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(app_module, '_frontend_event', broken)
+    with pytest.raises(RuntimeError):
+        client.get('/events/search?q=boom&limit=1')
+    assert 'route="/events/search",status="500"' in app_module.REGISTRY.render()
+
+
+def test_image_stats_do_not_create_the_pipeline(client):
+    response = client.get('/scrape/images')
+    assert response.status_code == 200
+    if 'image_pipeline' in sys.modules:
+        assert sys.modules['image_pipeline'].peek_image_pipeline() is None
+    assert response.json()['images'] is None
@@ -0,0 +1,117 @@
+"""
+Declarative extraction over the synthetic listing pages in benchmarks/
+"""
+
+import os
+import sys
+
+import httpx
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from extraction import DeclarativeScraper, compile_selector, compile_spec  # noqa: E402
+from new_scrapers import EVENTBRITE_SPEC, INC42_SPEC, EventbriteScraper, Inc42Scraper  # noqa: E402
+from page_cache import PageCache  # noqa: E402
+from synthetic_pages import eventbrite, inc42  # noqa: E402
+
+INC42_URL = INC42_SPEC['urls'][0]
+EVENTBRITE_URL = EVENTBRITE_SPEC['urls'][0]
+
+
+class PageClient:
+    """Answers GETs from a dict of pages; other URLs are 404s"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        request = httpx.Request('GET', url)
+        if url not in self.pages:
+            return httpx.Response(404, content=b'<html>Not found</html>', request=request)
+        return httpx.Response(200, content=self.pages[url], request=request)
+
+
+def offline(scraper, pages):
+    scraper.http = PageClient(pages)
+    scraper.page_cache = PageCache(enabled=False)
+    return scraper
+
+
+def test_inc42_fields():
+    events = Inc42Scraper().extract(inc42(3), INC42_URL)
+    assert [event['title'] for event in events] == [
+        f'Startup funding summit edition {i} announced' for i in range(3)
+    ]
+    first = events[0]
+    assert first['source_url'] == 'https://inc42.com/buzz/startup-summit-0'
+    assert first['description'] == 'Founders and investors meet at edition 0.'
+    assert first['date'] == '2025-11-01'
+    assert first['image_url'] == 'https://inc42.com/wp-content/uploads/0.jpg'
+    assert first['organizer'] == 'Inc42' and first['location'] == 'India'
+
+
+def test_inc42_keyword_filter_and_defaults():
+    page = inc42(1).replace(b'Startup funding summit edition 0 announced', b'Quarterly results of a listed company')
+    assert Inc42Scraper().extract(page, INC42_URL) == []
+
+    page = inc42(1).replace(b"<p class='excerpt'>Founders and investors meet at edition 0.</p>", b'')
+    event = Inc42Scraper().extract(page, INC42_URL)[0]
+    assert event['description'] == INC42_SPEC['fields']['description']['default']
+
+
+def test_inc42_card_limits():
+    scraper = offline(Inc42Scraper(), {INC42_URL: inc42(50)})
+    assert len(scraper.extract(inc42(50), INC42_URL)) == INC42_SPEC['limit']
+    assert len(scraper.scrape()) == INC42_SPEC['max_events']
+
+
+def test_eventbrite_fields():
+    events = EventbriteScraper().extract(eventbrite(2), EVENTBRITE_URL)
+    assert len(events) == 2
+    first = events[0]
+    assert first['title'] == 'Startup networking night 0'
+    assert first['source_url'] == 'https://www.eventbrite.com/e/startup-night-0'
+    assert first['date'] == '2025-12-01'
+    assert first['location'] == 'Bengaluru, India'
+    assert first['description'] == 'Meet founders at night 0.'
+    assert first['image_url'] == 'https://img.evbuc.com/0.jpg'
+    assert first['organizer'] == 'Eventbrite'
+
+
+def test_eventbrite_selector_fallbacks():
+    page = eventbrite(1).replace(b"<h3 class='event-card__title'>", b'<h4>').replace(b'</h3>', b'</h4>')
+    page = page.replace(b"<div class='location-info'>Bengaluru, India</div>", b'')
+    event = EventbriteScraper().extract(page, EVENTBRITE_URL)[0]
+    assert event['title'] == 'Startup networking night 0'
+    assert event['location'] == 'India'
+
+
+def test_scrape_falls_back_to_the_next_url():
+    second = INC42_SPEC['urls'][1]
+    scraper = offline(Inc42Scraper(), {second: inc42(3)})
+    events = scraper.scrape()
+    assert len(events) == 3
+    assert scraper.http.requested == [INC42_URL, second]
+
+
+def test_spec_without_subclass():
+    spec = dict(EVENTBRITE_SPEC, limit=None)
+    events = offline(DeclarativeScraper(spec), {EVENTBRITE_URL: eventbrite(30)}).scrape()
+    assert len(events) == 30
+
+
+@pytest.mark.parametrize('selector', ['div > p', 'div p', 'a:hover'])
+def test_unsupported_selectors_are_rejected(selector):
+    with pytest.raises(ValueError):
+        compile_selector(selector)
+
+
+def test_unknown_transform_is_rejected():
+    spec = dict(INC42_SPEC, fields={'title': {'select': 'h2', 'transform': 'nope'}})
+    with pytest.raises(ValueError):
+        compile_spec(spec)
@@ -0,0 +1,63 @@
+"""
+LeaderElection.stats() does not wait for a leadership check's MySQL round-trip
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leader import LeaderElection  # noqa: E402
+
+
+class SlowLockDatabase:
+    """Connections whose lock queries block until released, then report the lock as held"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.executing = threading.Event()
+
+    def get_connection(self):
+        database = self
+
+        class Cursor:
+            def execute(self, query, params=None):
+                database.executing.set()
+                database.release.wait(5)
+
+            def fetchone(self):
+                return (1,)
+
+            def close(self):
+                pass
+
+        class Connection:
+            autocommit = False
+
+            def cursor(self):
+                return Cursor()
+
+            def close(self):
+                pass
+
+        return Connection()
+
+
+def test_stats_do_not_block_on_a_running_check():
+    database = SlowLockDatabase()
+    leader = LeaderElection(database)
+    check = threading.Thread(target=leader.check)
+    check.start()
+    try:
+        assert database.executing.wait(5)
+        start = time.perf_counter()
+        stats = leader.stats()
+        assert time.perf_counter() - start < 1
+        assert stats['is_leader'] is False
+    finally:
+        database.release.set()
+        check.join()
+    assert leader.stats()['is_leader'] is True
+    assert leader.stats()['acquisitions'] == 1
@@ -0,0 +1,39 @@
+"""
+PageCache.fetch raises for error statuses whether or not the cache is enabled
+"""
+
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_cache import PageCache  # noqa: E402
+
+URL = 'https://example.com/events'
+
+
+class StatusClient:
+    """Answers every GET with the given status and body"""
+
+    def __init__(self, status_code, content=b'<html>Not found</html>'):
+        self.status_code = status_code
+        self.content = content
+
+    def get(self, url, **kwargs):
+        return httpx.Response(self.status_code, content=self.content, request=httpx.Request('GET', url))
+
+
+@pytest.mark.parametrize('enabled', [False, True])
+def test_fetch_raises_for_error_pages(tmp_path, enabled):
+    cache = PageCache(cache_dir=str(tmp_path), enabled=enabled)
+    with pytest.raises(httpx.HTTPStatusError):
+        cache.fetch(StatusClient(404), URL, source='Test')
+
+
+def test_disabled_fetch_returns_ok_pages(tmp_path):
+    cache = PageCache(cache_dir=str(tmp_path), enabled=False)
+    response = cache.fetch(StatusClient(200, b'<html>events</html>'), URL, source='Test')
+    assert response.content == b'<html>events</html>'
@@ -0,0 +1,37 @@
+"""
+AdaptiveScheduler never retries a failing source sooner than its regular interval
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scheduler  # noqa: E402
+from scheduler import AdaptiveScheduler  # noqa: E402
+
+
+class FakeManager:
+    sources = ['Static']
+
+    def scrape_interval(self, source):
+        return None
+
+
+def test_error_backoff_starts_at_the_interval(monkeypatch):
+    monkeypatch.setattr(scheduler, 'JITTER', 0)
+    schedule = AdaptiveScheduler(FakeManager(), default_interval=1800)
+    delays = []
+    for _ in range(8):
+        schedule.record('Static', 'error', now=0)
+        delays.append(schedule._states['Static'].next_run)
+    assert delays[:5] == [1800] * 5
+    assert delays[5:] == [1920, 3840, 7680]
+
+
+def test_error_backoff_is_capped(monkeypatch):
+    monkeypatch.setattr(scheduler, 'JITTER', 0)
+    schedule = AdaptiveScheduler(FakeManager(), default_interval=1800)
+    for _ in range(20):
+        schedule.record('Static', 'error', now=0)
+    assert schedule._states['Static'].next_run == scheduler.MAX_INTERVAL
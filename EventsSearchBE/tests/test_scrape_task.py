@@ -0,0 +1,42 @@
+"""
+The /scrape background task saves, logs and reschedules sources through ScraperManager.scrape_all
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+
+EVENT = {'title': 'Demo Day', 'date': '2025-12-01', 'source_url': 'https://example.com/demo-day'}
+
+
+def test_scrape_task_logs_scraper_errors_and_reschedules(monkeypatch):
+    manager = app_module.scraper_manager
+    logged = {}
+    recorded = {}
+
+    def run_all_scrapers(**kwargs):
+        manager.last_errors = {'Broken': 'HTTP 500'}
+        manager.last_unchanged = []
+        return {'Working': [EVENT], 'Broken': []}
+
+    def sync_source_events(events, source):
+        return {'new': len(events), 'changed': 0, 'unchanged': 0, 'disappeared': 0}
+
+    monkeypatch.setattr(manager, 'run_all_scrapers', run_all_scrapers)
+    monkeypatch.setattr(manager, 'settle_page_cache', lambda source, persisted: None)
+    monkeypatch.setattr(app_module.db, 'sync_source_events', sync_source_events)
+    monkeypatch.setattr(app_module.db, 'log_scraping_result',
+                        lambda source, **result: logged.__setitem__(source, result))
+    monkeypatch.setattr(app_module.scheduler, 'record',
+                        lambda source, outcome: recorded.__setitem__(source, outcome))
+
+    app_module.scrape_all_sources()
+
+    assert logged['Working']['success'] and logged['Working']['events_found'] == 1
+    assert not logged['Broken']['success']
+    assert logged['Broken']['error_message'] == 'HTTP 500'
+    assert recorded == {'Working': 'changed', 'Broken': 'error'}
+    assert 'Broken' not in manager.last_changes
@@ -0,0 +1,109 @@
+"""
+SuggestIndex ranking, fuzzy matching, refresh and memory budget against a fake database
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from suggest_index import SuggestIndex  # noqa: E402
+
+EVENTS = [
+    ('Startup Pitch Night', 'Eventbrite'),
+    ('Startup Demo Day', 'Inc42'),
+    ('Startups Weekend Bengaluru Edition', 'Eventbrite'),
+    ('Pitch Perfect Workshop', 'T-Hub'),
+]
+
+
+class FakeDatabase:
+    """get_suggestion_rows over an in-memory list of canonical events, ids ascending"""
+
+    def __init__(self, events=EVENTS):
+        self.rows = []
+        for title, organizer in events:
+            self.add(title, organizer)
+
+    def add(self, title, organizer):
+        self.rows.append({'id': len(self.rows) + 1, 'title': title, 'organizer': organizer})
+
+    def get_suggestion_rows(self, before_id=None, after_id=None, limit=1000):
+        if after_id is not None:
+            return [row for row in self.rows if row['id'] > after_id][:limit]
+        newest_first = [row for row in reversed(self.rows) if before_id is None or row['id'] < before_id]
+        return newest_first[:limit]
+
+
+def built(database=None, **kwargs):
+    index = SuggestIndex(**kwargs)
+    index.rebuild(database or FakeDatabase(), batch_size=2)
+    return index
+
+
+def texts(suggestions):
+    return [suggestion['text'] for suggestion in suggestions]
+
+
+def test_prefix_matches_rank_shortest_first():
+    suggestions = built().suggest('startup')
+    assert texts(suggestions) == ['Startup Demo Day', 'Startup Pitch Night', 'Startups Weekend Bengaluru Edition']
+    assert all(suggestion['score'] == 2.0 for suggestion in suggestions)
+    assert suggestions[0]['event_id'] == 2
+
+
+def test_organizers_are_indexed_once():
+    suggestions = built().suggest('event')
+    assert suggestions == [{'text': 'Eventbrite', 'kind': 'organizer', 'event_id': None, 'score': 2.0}]
+
+
+def test_mid_title_words_and_typos_match_fuzzily():
+    index = built()
+    assert texts(index.suggest('demo')) == ['Startup Demo Day']
+    assert texts(index.suggest('statrup pitch')) == ['Startup Pitch Night']
+    assert texts(index.suggest('pich night')) == ['Startup Pitch Night']
+    assert index.suggest('zzz') == []
+
+
+def test_prefix_matches_outrank_fuzzy_ones():
+    scores = [suggestion['score'] for suggestion in built().suggest('pitch', limit=5)]
+    assert scores == sorted(scores, reverse=True)
+    assert texts(built().suggest('pitch'))[0] == 'Pitch Perfect Workshop'
+
+
+def test_refresh_adds_events_ingested_since_the_build():
+    database = FakeDatabase()
+    index = built(database)
+    database.add('Founder Fireside Chat', 'NASSCOM')
+    assert index.suggest('founder') == []
+    index.refresh(database)
+    assert texts(index.suggest('founder')) == ['Founder Fireside Chat']
+    assert index.stats()['last_event_id'] == 5
+
+
+def test_refresh_before_a_build_does_nothing():
+    index = SuggestIndex()
+    index.refresh(FakeDatabase())
+    assert not index.ready
+    assert index.suggest('startup') == []
+
+
+def test_rebuild_keeps_the_newest_events_within_budget():
+    database = FakeDatabase([(f'Event number {i}', 'Organizer') for i in range(50)])
+    index = built(database, max_bytes=8000)
+    stats = index.stats()
+    assert 0 < stats['entries'] < 51
+    assert stats['approx_bytes'] <= 8000
+    assert texts(index.suggest('event number 49'))[0] == 'Event number 49'
+    assert 'Event number 0' not in texts(index.suggest('event number 0', limit=50))
+
+
+def test_adding_past_the_budget_evicts_the_oldest_entries():
+    index = built(max_bytes=8000)
+    for i in range(50):
+        index.add(f'Added event {i}', 'title', 100 + i)
+    stats = index.stats()
+    assert stats['evictions'] > 0
+    assert stats['approx_bytes'] <= 8000
+    assert index.suggest('startup') == []
+    assert texts(index.suggest('added event 49'))[0] == 'Added event 49'
@@ -0,0 +1,93 @@
+"""
+Standalone scrape worker
+Runs ScraperManager on the adaptive per-source schedule in its own process and
+writes to the same database as the API. Start the API with SCRAPER_MODE=api so
+it never scrapes; several workers may run, the MySQL leader lock keeps one active.
+
+Usage: python -m EventsSearchBE.worker [--once] [--sources Eventbrite,Inc42] [--metrics-port 9101]
+"""
+
+import argparse
+import os
+import signal
+import sys
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import MIGRATE_ON_STARTUP, DatabaseManager
+from http_client import close_http_client
+from image_pipeline import close_image_pipeline
+from leader import LeaderElection
+from metrics import REGISTRY
+from scheduler import AdaptiveScheduler
+from scraper_manager import ScraperManager
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port: int) -> ThreadingHTTPServer:
+    """Expose the worker's scraper and database metrics at :port/metrics"""
+    server = ThreadingHTTPServer(('0.0.0.0', port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Standalone scrape worker")
+    parser.add_argument('--once', action='store_true',
+                        help="scrape every (selected) source once and exit, without leader election")
+    parser.add_argument('--sources', help="comma-separated source names to scrape (default: all)")
+    parser.add_argument('--metrics-port', type=int, default=int(os.getenv('WORKER_METRICS_PORT', 0)),
+                        help="serve Prometheus metrics on this port (0 disables)")
+    args = parser.parse_args()
+    sources = [source.strip() for source in args.sources.split(',')] if args.sources else None
+
+    db = DatabaseManager(init_schema=MIGRATE_ON_STARTUP)
+    manager = ScraperManager(db, sources=sources)
+    metrics_server = serve_metrics(args.metrics_port) if args.metrics_port else None
+
+    try:
+        if args.once:
+            manager.scrape_all(sources=sources)
+            for source, outcome in manager.last_outcomes.items():
+                print(f"{source}: {outcome}")
+            return
+
+        leader = LeaderElection(db) if os.getenv('SCRAPER_LEADER_ELECTION', 'true').lower() == 'true' else None
+        scheduler = AdaptiveScheduler(manager, db, leader=leader)
+
+        def shutdown(signum, frame):
+            print(f"[{datetime.now()}] Worker stopping after the current run...")
+            scheduler.stop()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+        print(f"[{datetime.now()}] Scrape worker started for {len(manager.sources)} sources")
+        scheduler.run()
+    finally:
+        if metrics_server:
+            metrics_server.shutdown()
+        close_http_client()
+        close_image_pipeline()
+        db.close()
+
+
+if __name__ == '__main__':
+    main()